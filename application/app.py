@@ -1,61 +1,181 @@
+from __future__ import annotations
 import math
 import os
-from typing import List, Dict
+import time
+from typing import Callable, List, Dict, Optional, Tuple
 import datetime
-import numpy as np
+from domain.lazy import lazy_import
 from application.ports.i_repository import IRepository
+from application.result_cache import ResultCache
 from domain import (
-    RangeDomain, EnumerationDomain,
+    RangeDomain,
     Event, Model, Object, Observable,
     PlotData, Property, Record,
     Stats, StatsAnalyzer,
     Variable, VariableData,
+    VectorStatsAnalyzer,
 )
+from domain.accumulator import StatsAccumulator
 from domain.domain import ValueType
+from domain.duration import format_duration, parse_duration
+from domain.bootstrap import ResidualBootstrap
+from domain.histogram import Histogram
+from domain.regression import FIT_METHODS, PolynomialFit
+from domain.resample import Resampler
+from domain.series import TimeSeries
+from domain.smoothing import ExponentialSmoother
+from domain.rolling import RollingStats, RollingWindow
+from domain.sketch import TDigest
+from domain.stats import DEFAULT_PERCENTILES, DEFAULT_TOP_VALUES
 from domain.script import Script
 from infrastructure.environment.environment import Env
 
+np = lazy_import("numpy")
+
 
 class App:
 
-    def __init__(self, repository: IRepository):
+    def __init__(
+            self,
+            repository: IRepository,
+            dedup: bool = False,
+            cache_entries: int = 256,
+            cache_bytes: Optional[int] = 64 * 1024 * 1024,
+            snapshot_interval: float = 300.0,
+    ):
         self.repository : IRepository      = repository
+        # Taken before loading, so that a write racing the load shows up as a change
+        self._loaded_version: Optional[tuple] = self.repository.version()
         self.observables: List[Observable] = self.repository.load_observables()
         self.events     : List[Event]      = self.repository.load_events()
-        self.model      : Model            = Model(self.events)
+        self.model      : Model            = Model(self.events, self.repository.load_snapshot())
+        # When enabled, a state identical to the observable's previous one is stored as an "unchanged" marker
+        self.dedup      : bool             = dedup
+        self._state_digests: Dict[str, str] = {}
+        # Stats, plot data and extrapolations, keyed by their inputs and the variable's data version
+        self.cache      : ResultCache      = ResultCache(cache_entries, cache_bytes)
+        # The snapshot is rewritten at most every snapshot_interval seconds; events after it are replayed on load
+        self.snapshot_interval: float = snapshot_interval
+        self._snapshot_saved: Optional[float] = None
 
     def update_repository(self, repository: IRepository):
+        # Taken before loading (a racing write shows up as a change) but recorded only once
+        # everything loaded: after a failed load the App stays stale and the next check retries
+        version = repository.version()
+        observables = repository.load_observables()
+        events = repository.load_events()
+        model = Model(events, repository.load_snapshot())
         self.repository: IRepository = repository
-        self.observables: List[Observable] = self.repository.load_observables()
-        self.events: List[Event] = self.repository.load_events()
-        self.model: Model = Model(self.events)
+        self.observables: List[Observable] = observables
+        self.events: List[Event] = events
+        self.model: Model = model
+        self._loaded_version = version
+        # Versions restart with the new model: older entries could collide with new ones
+        self.cache.clear()
+
+    def reload_if_stale(self) -> bool:
+        """
+        Reload observables, events and model when the repository changed since they were loaded
+        (e.g. written by another process). Returns whether a reload happened.
+        """
+        version = self.repository.version()
+        if version is None or version == self._loaded_version:
+            return False
+        self.update_repository(self.repository)
+        return True
+
+    def cache_stats(self) -> Dict[str, object]:
+        """Size and hit/miss counters of the result cache, for tuning its bounds."""
+        return self.cache.stats()
+
+    def _variable(self, object_name: str, variable_name: str) -> Variable:
+        obj = next(item for item in self.model.objects if item.name == object_name)
+        return obj.variables[variable_name]
 
-    def new_observable(self, name: str, source: str):
-        obs = Observable(name=name, source=source)
+    def new_observable(
+            self,
+            name: str,
+            source: str,
+            interval: Optional[float] = None,
+            include: Optional[List[str]] = None,
+            exclude: Optional[List[str]] = None,
+    ):
+        obs = Observable(name=name, source=source, interval=interval, include=include, exclude=exclude)
         self.observables.append(obs)
-        self.repository.save_observables(self.observables)
+        self._save_observables()
 
     def update_observable(self, observable: Observable, new_name: str, new_source: str):
         observable.name = new_name
         observable.source = new_source
-        self.repository.save_observables(self.observables)
+        self._save_observables()
 
     def remove_observable(self, observable: Observable):
         self.observables = [o for o in self.observables if o.name != observable.name]
+        self._save_observables()
+
+    def _save_observables(self):
         self.repository.save_observables(self.observables)
+        # Our own write: the loaded state is still current
+        self._loaded_version = self.repository.version()
 
     def new_event(self):
+        event = self.sample(self.observables)
+        self.commit_events([event])
+
+    @staticmethod
+    def sample(observables: List[Observable]) -> Event:
+        """Fetch the state of the given observables into a single event stamped now."""
         time = datetime.datetime.now(datetime.timezone.utc)
         records: List[Record] = []
-        for observable in self.observables:
+        for observable in observables:
             state: List[Property] = observable.fetch_state()
             record = Record(observable.name, state)
             records.append(record)
 
-        event = Event(records, time)
-        events = self.repository.load_events()
-        events.append(event)
-        self.repository.save_events(events)
+        return Event(records, time)
+
+    def commit_events(self, events: List[Event]):
+        """Persist a batch of events in one repository write and fold them into the in-memory model."""
+        if not events:
+            return
+        if self.dedup:
+            events = [self._deduplicate(event) for event in events]
+        self.repository.append_events(events)
+        for event in events:
+            self.events.append(event)
+            self.model.ingest(event)
+        if self._snapshot_saved is None or time.monotonic() - self._snapshot_saved >= self.snapshot_interval:
+            self.save_snapshot()
+        else:
+            self._loaded_version = self.repository.version()
+
+    def save_snapshot(self):
+        """Persist the model snapshot now (commit_events throttles it to every snapshot_interval seconds)."""
+        self.repository.save_snapshot(self.model.snapshot())
+        self._snapshot_saved = time.monotonic()
+        self._loaded_version = self.repository.version()
+
+    def _deduplicate(self, event: Event) -> Event:
+        """Replace records whose state hashes like the observable's previous state with markers."""
+        records: List[Record] = []
+        for record in event.records:
+            if record.unchanged or not record.state:
+                records.append(record)
+                continue
+
+            previous = self._state_digests.get(record.observable)
+            if previous is None:
+                last_state = self.model.last_state(record.observable)
+                if last_state is not None:
+                    previous = Record(record.observable, last_state).state_digest()
+
+            digest = record.state_digest()
+            self._state_digests[record.observable] = digest
+            if digest == previous:
+                records.append(Record(record.observable, [], unchanged=True))
+            else:
+                records.append(record)
+        return Event(records, event.timestamp)
 
     def list_observables(self) -> List[Observable]:
         return self.observables
@@ -92,19 +212,109 @@ class App:
 
 
     def compute_stats_within_range(self, object_name: str, variable_name: str, domain_min, domain_max) -> Stats:
-        obj = next(item for item in self.model.objects if item.name == object_name)
+        variable = self._variable(object_name, variable_name)
+        key = ("stats-range", object_name, variable_name, domain_min, domain_max, variable.data.version)
+        return self.cache.get_or_compute(key, lambda: self._stats_within_range(variable, domain_min, domain_max))
+
+    @staticmethod
+    def _stats_within_range(variable: Variable, domain_min, domain_max) -> Stats:
         domain = RangeDomain(domain_min, domain_max)
-        variable = obj.variables.get(variable_name)
-        stats = StatsAnalyzer.compute(variable, domain)
-        return stats
+        if StatsAnalyzer.covers_history(variable, domain):
+            return StatsAnalyzer.compute_whole_history(variable, numeric=True)
+        return VectorStatsAnalyzer.compute(variable, domain)
 
     def compute_stats_for_values(self, object_name: str, variable_name: str) -> Stats:
+        variable = self._variable(object_name, variable_name)
+        key = ("stats-values", object_name, variable_name, variable.data.version)
+        # Every known value is in the domain: read the whole-history accumulator instead of rescanning
+        return self.cache.get_or_compute(key, lambda: StatsAnalyzer.compute_whole_history(variable, numeric=False))
+
+    def compute_stats_window(self, object_name: str, variable_name: str, start, end) -> Stats:
+        """
+        Count, mean, std, min and max of the numeric values timestamped within [start, end]
+        (datetimes, ISO strings or epoch seconds; None leaves that side open), answered in
+        O(log n) from the variable's prefix-sum index.
+        """
+        index = self._variable(object_name, variable_name).data.window_index()
+        window = index.query(self._epoch(start, -math.inf), self._epoch(end, math.inf))
+        count = int(window["count"][0])
+        if not count:
+            return Stats(events=0)
+        return Stats(
+            events=count,
+            mean=float(window["mean"][0]),
+            std=float(window["std"][0]),
+            min=window["min"][0].item(),
+            max=window["max"][0].item(),
+        )
+
+    def compute_stats_windows(self, object_name: str, variable_name: str, starts, ends) -> Dict[str, np.ndarray]:
+        """Vectorized compute_stats_window over many windows: arrays of count/mean/std/min/max aligned with starts/ends."""
+        index = self._variable(object_name, variable_name).data.window_index()
+        return index.query(
+            [self._epoch(s, -math.inf) for s in starts],
+            [self._epoch(e, math.inf) for e in ends],
+        )
+
+    @staticmethod
+    def time_bounds(start=None, end=None) -> Tuple[float, float]:
+        """Epoch-second bounds of a time range given as ISO strings, datetimes or epoch seconds (None: open)."""
+        return App._epoch(start, -math.inf), App._epoch(end, math.inf)
+
+    def get_variable_columns(self, object_name: str, variable_name: str, start=None,
+                             end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Time-sorted epoch-second timestamps and values of a variable within [start, end] (see
+        time_bounds), as views of the variable's cached columns rather than copies.
+        """
+        timestamps, values = self._variable(object_name, variable_name).data.columns(sort=True)
+        lo, hi = self.time_bounds(start, end)
+        first, last = np.searchsorted(timestamps, lo, side="left"), np.searchsorted(timestamps, hi, side="right")
+        return timestamps[first:last], values[first:last]
+
+    @staticmethod
+    def _epoch(moment, default: float) -> float:
+        if moment is None or moment == "":
+            return default
+        if isinstance(moment, str):
+            moment = datetime.datetime.fromisoformat(moment)
+        if isinstance(moment, datetime.datetime):
+            # Stored timestamps are UTC, so naive times are too (not the machine's local time)
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=datetime.timezone.utc)
+            return moment.timestamp()
+        return float(moment)
+
+    def compute_top_values(self, object_name: str, variable_name: str, n: int = DEFAULT_TOP_VALUES) -> List[tuple]:
+        """
+        The n most frequent values of a variable as (value, count, error), the true count lying in
+        [count - error, count]. Exact (error 0) below the accumulator's cardinality threshold,
+        estimated by fixed-memory heavy-hitter sketches above it.
+        """
+        obj = next(item for item in self.model.objects if item.name == object_name)
+        variable = obj.variables[variable_name]
+        return variable.data.current_accumulator().top(n)
+
+    def compute_percentiles(
+            self,
+            object_name: str,
+            variable_name: str,
+            percentiles: Optional[List[float]] = None,
+            compression: Optional[float] = None,
+    ) -> Dict[float, Optional[float]]:
+        """
+        Approximate whole-history percentiles (0..100) of a numeric variable, read from its t-digest.
+        A compression other than the digest's rebuilds a digest of that accuracy from the values.
+        """
         obj = next(item for item in self.model.objects if item.name == object_name)
         variable = obj.variables[variable_name]
-        known_values = variable.data.all_values()
-        domain = EnumerationDomain(known_values)
-        stats = StatsAnalyzer.compute(variable, domain)
-        return stats
+        percentiles = percentiles or list(DEFAULT_PERCENTILES)
+        acc = variable.data.current_accumulator()
+        if compression is None or compression == acc.digest.compression:
+            return acc.percentiles(percentiles)
+        digest = TDigest(compression)
+        digest.update(v for v in variable.data.values() if StatsAccumulator.is_numeric(v))
+        return digest.percentiles(percentiles)
 
     def compute_extrapolation(
             self,
@@ -113,71 +323,128 @@ class App:
             x_min=None,
             x_max=None,
             precision: int = 86400,  # in seconds
-            method: str = "linear"
-    ):
-
-        obj = next(item for item in self.model.objects if item.name == object_name)
-        variable = obj.variables[variable_name]
-        x = list(variable.data.keys())
-        y = list(variable.data.values())
+            method: str = "linear",
+            max_points: Optional[int] = 2000,
+            window: Optional[Tuple[float, float]] = None,
+            bands: int = 0,
+            confidence: float = 0.9,
+    ) -> TimeSeries:
+        """
+        Fitted values of the variable over a time grid from x_min to x_max (default: the data's
+        time span) with a step of `precision` seconds, widened so that the grid has at most
+        max_points points (e.g. the plot's width in pixels).
+
+        Methods: "linear" and "quadratic" least-squares trends, fitted on the whole history or
+        on the samples within `window` (start, end epoch seconds), and "simple", "holt" and
+        "holt-winters" exponential smoothing, forecast from the current smoothing state.
+
+        With bands > 0, least-squares trends also carry `confidence` prediction bands from that
+        many residual bootstrap resamples (series.bands, with the time they took).
+        """
+        variable = self._variable(object_name, variable_name)
+        key = ("extrapolation", object_name, variable_name, x_min, x_max, precision, method, max_points,
+               window, bands, confidence, variable.data.version)
+
+        def compute() -> TimeSeries:
+            model = self._extrapolation_model(object_name, variable_name, method, window)
+            series = self._extrapolate(variable, model, x_min, x_max, precision, max_points)
+            if bands and isinstance(model, PolynomialFit) and len(series):
+                timestamps, values = self._window_columns(variable.data, window)
+                series.bands = ResidualBootstrap.bands(timestamps, values, model, series.x, bands, confidence)
+            return series
+
+        return self.cache.get_or_compute(key, compute)
+
+    def _extrapolation_model(self, object_name: str, variable_name: str, method: str,
+                             window: Optional[Tuple[float, float]]) -> Optional[Callable[[np.ndarray], np.ndarray]]:
+        """The function of epoch seconds an extrapolation method evaluates over its grid."""
+        if method in ExponentialSmoother.METHODS:
+            # Smoothing state is streamed over the whole history; it has no window
+            smoother = self._variable(object_name, variable_name).data.smoother(method)
+            return smoother.forecast if smoother.count else None
+        return self.fit_trend(object_name, variable_name, method, window)
+
+    def fit_trend(
+            self,
+            object_name: str,
+            variable_name: str,
+            method: str = "linear",
+            window: Optional[Tuple[float, float]] = None,
+    ) -> Optional[PolynomialFit]:
+        """
+        Least-squares trend of a variable's numeric values ("linear" or "quadratic"), None without
+        numeric data. The whole-history fit is solved from the variable's running sums in O(1);
+        a window (start, end epoch seconds, inclusive) is fitted from its slice of the series.
+        Coefficients are cached per (variable, method, window) until the next insertion.
+        """
+        if method not in FIT_METHODS:
+            raise ValueError(f"Unknown extrapolation method: {method}")
+        variable = self._variable(object_name, variable_name)
+        key = ("fit", object_name, variable_name, method, window, variable.data.version)
+        return self.cache.get_or_compute(key, lambda: self._fit(variable.data, FIT_METHODS[method], window))
 
-        if not x or not y:
-            return {}
+    @staticmethod
+    def _fit(variable_data: VariableData, degree: int,
+             window: Optional[Tuple[float, float]]) -> Optional[PolynomialFit]:
+        if window is None:
+            return variable_data.regression.fit(degree)
+        return PolynomialFit.fit(*App._window_columns(variable_data, window), degree)
 
-        # --- Normalize x_min and x_max ---
-        # They may already be datetime objects (from DateEntry) or None
-        if isinstance(x_min, str) and x_min.strip():
-            x_min_dt = datetime.datetime.strptime(x_min, "%m-%d-%Y")
-        elif isinstance(x_min, datetime.datetime):
-            x_min_dt = x_min
-        else:
-            x_min_dt = min(x)
+    @staticmethod
+    def _window_columns(variable_data: VariableData,
+                        window: Optional[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Time-sorted numeric columns, restricted to a (start, end) window when given."""
+        timestamps, values = variable_data.numeric_columns()
+        if window is None:
+            return timestamps, values
+        lo, hi = np.searchsorted(timestamps, window[0], side="left"), np.searchsorted(timestamps, window[1], side="right")
+        return timestamps[lo:hi], values[lo:hi]
 
-        if isinstance(x_max, str) and x_max.strip():
-            x_max_dt = datetime.datetime.strptime(x_max, "%m-%d-%Y")
-        elif isinstance(x_max, datetime.datetime):
-            x_max_dt = x_max
-        else:
-            x_max_dt = max(x)
-
-        # Align with tzinfo if needed
-        if x and x[0].tzinfo is not None:
-            if x_min_dt.tzinfo is None:
-                x_min_dt = x_min_dt.replace(tzinfo=x[0].tzinfo)
-            if x_max_dt.tzinfo is None:
-                x_max_dt = x_max_dt.replace(tzinfo=x[0].tzinfo)
-
-        # Ensure x_max_dt > x_min_dt
-        if x_max_dt <= x_min_dt:
-            x_max_dt = x_min_dt + datetime.timedelta(seconds=precision)
-
-        # Build new_x using precision directly
-        new_x = []
-        current = x_min_dt
-        while current <= x_max_dt:
-            new_x.append(current)
-            current += datetime.timedelta(seconds=precision)
-
-        # Ensure last point is exactly x_max_dt
-        if new_x[-1] != x_max_dt:
-            new_x.append(x_max_dt)
-
-        # Fit & extrapolate
-        x_num = np.array([dt.timestamp() for dt in x])
-        y_num = np.array(y)
-        new_x_num = np.array([dt.timestamp() for dt in new_x])
-
-        if method == "linear":
-            coeffs = np.polyfit(x_num, y_num, 1)
-        elif method == "quadratic":
-            coeffs = np.polyfit(x_num, y_num, 2)
-        else:
-            raise ValueError(f"Unknown extrapolation method: {method}")
+    @staticmethod
+    def time_grid(start: float, stop: float, step: float, max_points: Optional[int] = None) -> np.ndarray:
+        """
+        Epoch-second grid from start to stop (both included) every `step` seconds, built with
+        numpy.arange on int64 microseconds. With max_points, the step is widened as needed.
+        """
+        start_us, stop_us = int(round(start * 1e6)), int(round(stop * 1e6))
+        step_us = max(1, int(round(step * 1e6)))
+        if max_points and max_points > 1 and (stop_us - start_us) // step_us + 1 > max_points:
+            step_us = -(-(stop_us - start_us) // (max_points - 1))
+        grid = np.arange(start_us, stop_us + 1, step_us, dtype=np.int64)
+        if grid[-1] != stop_us:
+            grid = np.append(grid, stop_us)
+        return grid / 1e6
 
-        poly = np.poly1d(coeffs)
-        new_y = poly(new_x_num)
+    @staticmethod
+    def _extrapolate(variable: Variable, model: Optional[Callable[[np.ndarray], np.ndarray]], x_min, x_max,
+                     precision: int, max_points: Optional[int] = None) -> TimeSeries:
+        x_num, _ = variable.data.numeric_columns()
+        first = next(iter(variable.data.keys()), None)
+        tzinfo = first.tzinfo if first is not None else None
+        if not len(x_num) or model is None:
+            return TimeSeries(np.empty(0), np.empty(0), tzinfo)
 
-        return {dt: float(val) for dt, val in zip(new_x, new_y)}
+        # --- Normalize x_min and x_max ---
+        # They may be datetime objects (from DateEntry), "%m-%d-%Y" strings or None
+        def bound(value, default: float) -> float:
+            if isinstance(value, str) and value.strip():
+                value = datetime.datetime.strptime(value, "%m-%d-%Y")
+            if not isinstance(value, datetime.datetime):
+                return default
+            # Align with tzinfo if needed
+            if tzinfo is not None and value.tzinfo is None:
+                value = value.replace(tzinfo=tzinfo)
+            return value.timestamp()
+
+        start = bound(x_min, float(x_num[0]))
+        stop = bound(x_max, float(x_num[-1]))
+
+        # Ensure stop > start
+        if stop <= start:
+            stop = start + precision
+
+        new_x_num = App.time_grid(start, stop, precision, max_points)
+        return TimeSeries(new_x_num, model(new_x_num), tzinfo)
 
     def get_extrapolation_plot_data(self,
                                     object_name: str,
@@ -185,20 +452,208 @@ class App:
                                     method: str,
                                     x_min,
                                     x_max,
-                                    precision: int = 86400):
+                                    precision: int = 86400,
+                                    max_points: Optional[int] = 2000,
+                                    bands: int = 0,
+                                    confidence: float = 0.9) -> TimeSeries:
 
         extrapolation_data = self.compute_extrapolation(
-            object_name, variable_name, x_min, x_max, precision, method
+            object_name, variable_name, x_min, x_max, precision, method, max_points,
+            bands=bands, confidence=confidence,
         )
         return extrapolation_data
 
+    def forecast_all(
+            self,
+            method: str = "linear",
+            horizon="7d",
+            step="1d",
+            resample=None,
+            chunk_size: int = 256,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Least-squares forecasts ("linear" or "quadratic") of every numeric variable of every
+        object over a shared grid from the latest sample to `horizon` later, every `step`
+        (seconds or durations like "1h", "7d"). With `resample`, variables are first bucketed to
+        that interval (bucket means).
+
+        Variables sampled at the same times (e.g. recorded by the same events, or resampled
+        onto the same buckets) are fitted together in one least-squares solve; the others fall
+        back to per-variable fits (from their running sums when not resampled). Forecasts are
+        evaluated `chunk_size` variables at a time.
+
+        Returns columns "object", "variable", "time" (epoch seconds) and "value", one row per
+        variable and grid time.
+        """
+        if method not in FIT_METHODS:
+            raise ValueError(f"Unknown extrapolation method: {method}")
+        degree = FIT_METHODS[method]
+        interval = parse_duration(resample) if resample else None
+
+        series = []
+        last = None
+        for obj in self.model.objects:
+            for name, variable in obj.variables.items():
+                timestamps, values = variable.data.numeric_columns()
+                if not len(timestamps):
+                    continue
+                last = max(last, float(timestamps[-1])) if last is not None else float(timestamps[-1])
+                if interval:
+                    timestamps, values = Resampler.resample(timestamps, values, interval, "mean")
+                series.append((obj.name, name, variable.data, timestamps, values))
+
+        columns = {
+            "object": np.empty(0, dtype=object),
+            "variable": np.empty(0, dtype=object),
+            "time": np.empty(0),
+            "value": np.empty(0),
+        }
+        if not series:
+            return columns
+
+        # Group the series sampled at identical times
+        groups: Dict[bytes, List[int]] = {}
+        for i, (_, _, _, timestamps, _) in enumerate(series):
+            groups.setdefault(timestamps.tobytes(), []).append(i)
+
+        fits: List[Optional[PolynomialFit]] = [None] * len(series)
+        for members in groups.values():
+            if len(members) > 1:
+                values = np.column_stack([series[i][4] for i in members])
+                for i, fit in zip(members, PolynomialFit.fit_shared(series[members[0]][3], values, degree)):
+                    fits[i] = fit
+            else:
+                _, _, data, timestamps, values = series[members[0]]
+                fits[members[0]] = PolynomialFit.fit(timestamps, values, degree) if interval else data.regression.fit(degree)
+
+        grid = self.time_grid(last, last + parse_duration(horizon), parse_duration(step))
+        blocks = {key: [] for key in columns}
+        for start in range(0, len(series), chunk_size):
+            chunk = range(start, min(start + chunk_size, len(series)))
+            forecasts = PolynomialFit.evaluate_many([fits[i] for i in chunk], grid)
+            blocks["object"].append(np.repeat(np.array([series[i][0] for i in chunk], dtype=object), len(grid)))
+            blocks["variable"].append(np.repeat(np.array([series[i][1] for i in chunk], dtype=object), len(grid)))
+            blocks["time"].append(np.tile(grid, len(chunk)))
+            # Column-major: all grid times of a variable, then the next variable
+            blocks["value"].append(forecasts.ravel(order="F"))
+        return {key: np.concatenate(parts) for key, parts in blocks.items()}
+
     def get_variable_data(self, object_name: str, variable_name: str) -> VariableData:
         obj = next(item for item in self.model.objects if item.name == object_name)
         variable = obj.variables[variable_name]
         data = variable.data
         return data
 
-    def get_plot_data(self, object_name: str, variable_name: str, plot_type: str, variable_data: VariableData, y_resolution = 2) -> PlotData:
+    def get_plot_data(
+            self,
+            object_name: str,
+            variable_name: str,
+            plot_type: str,
+            variable_data: VariableData,
+            y_resolution = 2,
+            window: Optional[str] = None,
+            resample: Optional[str] = None,
+            aggregation: str = "mean",
+            bins: str = "fixed",
+    ) -> PlotData:
+        """
+        Plot data of a variable. plot_type is "time series", "distribution" (a histogram whose
+        bins follow `bins`: "fixed" width of y_resolution decimals, "fd", "sturges" or "quantile";
+        see Histogram) or "rolling" (moving mean, std, min and max over `window`: a
+        number of samples like "20", or a duration like "15m", "1h", "1d"; default "20").
+        A time series can be resampled into `resample` buckets ("1h", "1d", ...) aggregated with
+        mean, min, max, last, count, sum or mode.
+        """
+        args = (object_name, variable_name, plot_type, variable_data, y_resolution, window, resample, aggregation, bins)
+        if isinstance(variable_data, VariableData):
+            # Only the options the plot type uses, so that changing another one keeps it cached
+            if plot_type == "time series":
+                options = (resample, aggregation) if resample else ()
+            elif plot_type == "distribution":
+                options = (bins, y_resolution)
+            elif plot_type == "rolling":
+                options = (window or "20",)
+            else:
+                options = (y_resolution, window, resample, aggregation, bins)
+            key = ("plot", object_name, variable_name, plot_type, options, variable_data.version)
+            return self.cache.get_or_compute(key, lambda: self._build_plot_data(*args))
+        # Extrapolated series (a TimeSeries) are cached upstream by compute_extrapolation
+        return self._build_plot_data(*args)
+
+    def resample(
+            self,
+            object_name: str,
+            variable_name: str,
+            interval,
+            aggregation: str = "mean",
+    ) -> Tuple[List[datetime.datetime], list]:
+        """
+        The variable bucketed by a fixed interval (seconds, or a duration like "15m", "1h", "1d"),
+        as (bucket start times, aggregated values) over the non-empty buckets. Aggregations are
+        mean, min, max, last, count, sum, and mode for categorical values.
+        """
+        variable = self._variable(object_name, variable_name)
+        key = ("resample", object_name, variable_name, interval, aggregation, variable.data.version)
+        return self.cache.get_or_compute(key, lambda: self._resample(variable.data, interval, aggregation))
+
+    def _resample(self, variable_data, interval, aggregation: str) -> Tuple[List[datetime.datetime], list]:
+        seconds = parse_duration(interval)
+        numeric = aggregation in ("mean", "min", "max", "sum")
+        timestamps, values = self._numeric_columns(variable_data) if numeric else self._sorted_columns(variable_data)
+        starts, aggregated = Resampler.resample(timestamps, values, seconds, aggregation)
+        x = [datetime.datetime.fromtimestamp(t, datetime.timezone.utc) for t in starts.tolist()]
+        return x, aggregated.tolist()
+
+    @staticmethod
+    def _distribution(variable_data, bins: str, y_resolution) -> tuple:
+        """(x, counts, bar widths) of a distribution plot; widths is None for categorical values."""
+        if isinstance(variable_data, VariableData):
+            if variable_data.value_kind() != "object":
+                _, values = variable_data.columns()
+                left, widths, counts = Histogram.numeric(values, bins, y_resolution)
+                return left.tolist(), counts.tolist(), widths.tolist()
+            codes, uniques = variable_data.codes()
+        elif isinstance(variable_data, TimeSeries):
+            left, widths, counts = Histogram.numeric(variable_data.y, bins, y_resolution)
+            return left.tolist(), counts.tolist(), widths.tolist()
+        else:
+            values = list(variable_data.values())
+            if values and all(isinstance(v, (int, float)) for v in values):
+                left, widths, counts = Histogram.numeric(np.array(values, dtype=np.float64), bins, y_resolution)
+                return left.tolist(), counts.tolist(), widths.tolist()
+            index: Dict[ValueType, int] = {}
+            codes = np.array([index.setdefault(v, len(index)) for v in values], dtype=np.intp)
+            uniques = list(index)
+        x, y = Histogram.categorical(codes, uniques)
+        return x, y, None
+
+    @staticmethod
+    def _sorted_columns(variable_data) -> tuple:
+        """Time-sorted timestamps/values (any type) of a VariableData, a TimeSeries or a {datetime: value} dict."""
+        if isinstance(variable_data, VariableData):
+            return variable_data.columns(sort=True)
+        if isinstance(variable_data, TimeSeries):
+            return variable_data.x, variable_data.y
+        items = sorted(variable_data.items(), key=lambda item: item[0])
+        values = np.empty(len(items), dtype=object)
+        values[:] = [v for _, v in items]
+        return np.array([ts.timestamp() for ts, _ in items], dtype=np.float64), values
+
+    @staticmethod
+    def _numeric_columns(variable_data) -> tuple:
+        """Time-sorted numeric timestamps/values of a VariableData, a TimeSeries or a {datetime: value} dict."""
+        if isinstance(variable_data, VariableData):
+            return variable_data.numeric_columns()
+        if isinstance(variable_data, TimeSeries):
+            return variable_data.x, variable_data.y
+        items = sorted((ts.timestamp(), v) for ts, v in variable_data.items() if isinstance(v, (int, float)))
+        return (np.array([t for t, _ in items], dtype=np.float64),
+                np.array([v for _, v in items], dtype=np.float64))
+
+    def _build_plot_data(self, object_name: str, variable_name: str, plot_type: str, variable_data, y_resolution,
+                         window=None, resample=None, aggregation="mean", bins="fixed") -> PlotData:
+        series = None
+        widths = None
         # Extract values from the data
         values = list(variable_data.values())
 
@@ -217,7 +672,31 @@ class App:
         else:
             stats = self.compute_stats_for_values(object_name, variable_name)
 
-        if plot_type == "time series":
+        if plot_type == "time series" and resample:
+            # X is bucket start times, Y the aggregated values
+            x, y = self._resample(variable_data, resample, aggregation)
+
+            title = f"Time Series for {variable_name}"
+            subtitle = f"{object_name} · {aggregation} per {format_duration(parse_duration(resample))}"
+            x_label = "Time"
+            y_label = variable_name
+
+        elif plot_type == "time series" and isinstance(variable_data, TimeSeries):
+            # Computed series: datetimes are materialized for the (pixel-capped) grid only
+            x = variable_data.datetimes()
+            y = variable_data.y.tolist()
+
+            title = f"Time Series for {variable_name}"
+            subtitle = f"{object_name}"
+            if variable_data.bands is not None:
+                bands = variable_data.bands
+                series = {"lower": bands.lower.tolist(), "upper": bands.upper.tolist()}
+                subtitle += (f" · {bands.confidence:.0%} band, {bands.resamples} resamples"
+                             f" in {bands.seconds * 1000:.0f} ms")
+            x_label = "Time"
+            y_label = variable_name
+
+        elif plot_type == "time series":
             # X is timestamps, Y is values
             x = list(variable_data.keys())
             y = list(variable_data.values())
@@ -228,38 +707,27 @@ class App:
             y_label = variable_name
 
         elif plot_type == "distribution":
-
-            freq: Dict[ValueType, int] = {}
-
-            def apply_precision(v):
-                if isinstance(v, (int, float)) and y_resolution is not None:
-                    factor = 10 ** y_resolution
-                    return math.floor(v * factor) / factor
-                return v
-
-            for v in values:
-                try:
-                    v_precise = apply_precision(v)
-                    freq[v_precise] = freq.get(v_precise, 0) + 1
-                except TypeError:
-                    key = str(v)
-                    freq[key] = freq.get(key, 0) + 1
-
-            # Build axes from the frequencies
-            # Prefer a stable, readable order: try by key; if mixed types, fall back to frequency desc
-            try:
-                x = sorted(freq.keys())  # categories
-                y = [freq[k] for k in x]  # counts
-            except TypeError:
-                items = sorted(freq.items(), key=lambda kv: (-kv[1], str(kv[0])))
-                x = [k for k, _ in items]
-                y = [v for _, v in items]
+            x, y, widths = self._distribution(variable_data, bins, y_resolution)
 
             title = f"Distribution of {variable_name}"
             subtitle = f"{object_name}"
             x_label = variable_name
             y_label = "Frequency"
 
+        elif plot_type == "rolling":
+            rolling_window = RollingWindow.parse(window or "20")
+            timestamps, numeric = self._numeric_columns(variable_data)
+            rolling = RollingStats.compute(timestamps, numeric, rolling_window)
+
+            x = [datetime.datetime.fromtimestamp(t, datetime.timezone.utc) for t in timestamps.tolist()]
+            y = rolling["mean"].tolist()
+            series = {name: rolling[name].tolist() for name in ("std", "min", "max")}
+
+            title = f"Rolling mean of {variable_name}"
+            subtitle = f"{object_name} · window {rolling_window}"
+            x_label = "Time"
+            y_label = variable_name
+
         else:
             raise ValueError(f"Unsupported plot_type: {plot_type}")
 
@@ -274,6 +742,8 @@ class App:
             x_label=x_label,
             y_label=y_label,
             stats=stats,
+            series=series,
+            widths=widths,
         )
 
     @staticmethod
@@ -287,9 +757,14 @@ class App:
 
 Available Commands:
 
-- new-observable <observable_name> <source>
+- new-observable <observable_name> <source> [--interval <seconds>]
+                 [--include <pattern,...>] [--exclude <pattern,...>]
    - Creates a new observable with the given name and source.
-   - Example: new-observable temperature ./data/temp.json
+   - The optional interval sets how often the daemon samples it.
+   - Include/exclude path patterns select which parts of the source become variables
+     ('*' matches one path segment, '**' any number; '$.items[*].price' also works).
+   - Example: new-observable temperature ./data/temp.json --interval 30
+   - Example: new-observable shop https://example.com/api --include items/*/price
 
 - list-observables
    - Lists all registered observables.
@@ -301,6 +776,41 @@ Available Commands:
    - Lists all variables for the specified object.
    - Example: list-variables temperature_sensor
 
+- daemon [default_interval] [--jitter 0.1] [--batch-size 50] [--flush-interval 10] [--dedup]
+   - Keeps the application resident and samples every observable on its own interval
+     (in seconds; the observable's own interval, else default_interval), retrying failed
+     sources with exponential backoff and writing events in batches.
+   - Example: daemon 60 --batch-size 20
+   - Adaptive mode: daemon 60 --adaptive [--min-interval 1] [--max-interval 3600]
+                      [--threshold 0.05] [--fetch-budget <fetches per second>]
+     Samples volatile observables more often and stable ones less often, within the bounds.
+   - Watch mode: daemon 60 --watch [--poll-interval 1]
+     Samples local JSON observables only when their file changes.
+   - --dedup stores states identical to the previous sample as a small "unchanged" marker
+     (also accepted by new-event and ingest).
+
+- ingest [port] [--host 127.0.0.1] [--batch-size 1000] [--flush-interval 1] [--queue-size 10000] [--dedup]
+   - Starts a local HTTP endpoint to which producers push events (POST /events), as a JSON
+     object, a JSON array or JSON lines of Events or Records. Writes are batched; when the
+     queue is full requests are refused with 503 and Retry-After.
+   - Example: ingest 8765
+
+- batch [<file>|-] [--stop-on-error]
+   - Runs many commands in one process against one loaded application: one command per
+     line from a file, or from stdin when the file is omitted or '-'. Quotes group
+     arguments; blank lines and # comments are skipped.
+   - Each command's result is written as a JSON line as soon as it completes:
+     {"line", "command", "ok", "output", "error", "seconds"}.
+   - Exits with status 1 when any command failed (--stop-on-error stops at the first).
+   - Example: batch nightly.txt > results.jsonl
+
+- serve [--socket <path>]
+   - Keeps the application loaded and answers CLI commands over a Unix socket: while it
+     runs, other CLI calls are forwarded to it transparently and skip reloading the model.
+   - The server reloads by itself when the repository files change; daemon, ingest, gui
+     and serve always run in their own process.
+   - Example: serve
+
 - new-event <observable_name> <var1=value1> <var2=value2> ...
    - Creates a new event for the specified observable with variable assignments.
    - Example: new-event temperature value=22.5 timestamp=2025-08-31T12:00
@@ -310,17 +820,72 @@ Available Commands:
    - Example: compute-stats-range temperature value 10 30
 
 - compute-stats-values <object_name> <variable_name>
-   - Computes statistics for a variable across all observed values.
+   - Computes statistics for a variable across all observed values: event count, mode and the
+     most frequent values. Above 10000 distinct values (e.g. a continuous float) the counts are
+     heavy-hitter estimates, shown with their error and an "approximate: True" line.
    - Example: compute-stats-values climate temperature
-   
-- get-variable-data <object_name> <variable_name>
+
+- compute-stats-window <object_name> <variable_name> <start> <end>
+   - Count, mean, std, min and max of a numeric variable between two times (ISO 8601;
+     '-' leaves a side open), answered from an index without scanning the window.
+   - Example: compute-stats-window test-object temperature 2025-09-01T00:00 2025-09-02T00:00
+
+- compute-top-values <object_name> <variable_name> [n]
+   - Lists the n most frequent values of a variable (default 10) with their counts.
+   - Past 10000 distinct values, counts come from fixed-memory sketches and are shown
+     with their maximum overestimation (count ±error).
+   - Example: compute-top-values logs message 20
+
+- compute-percentiles <object_name> <variable_name> [percentile ...] [--compression 100]
+   - Approximate whole-history percentiles of a numeric variable (default: 50 90 99),
+     answered from a compact t-digest sketch without rescanning the values.
+   - A higher compression is more accurate (rank error roughly 1/compression).
+   - Example: compute-percentiles temperature value 50 95 99.9
+
+- get-variable-data <object_name> <variable_name> [--format json|jsonl|csv|npy] [--out <file>]
+                    [--start <time>] [--end <time>] [--columns time,value]
    - Retrieve the data for a given variable of an object.
    - Example: get-plot-data economics cash
-
-- get-plot-data <object_name> <variable_name> <plot_type>
+   - With any output option, the samples are streamed as a table (columns time, value)
+     instead of printed: --format picks the encoding (default from the --out extension,
+     else csv), --out a file instead of stdout, --start/--end (inclusive) a time range,
+     --columns a subset. npy is read back with numpy.load; within batch it needs --out.
+     These table outputs always run locally rather than through serve, so they stream.
+   - Example: get-variable-data economics cash --start 2025-01-01 --out cash.npy
+
+- resample <object_name> <variable_name> <interval> [aggregation]
+   - Buckets a variable by a fixed interval (e.g. 15m, 1h, 1d) aligned on the epoch,
+     aggregating each non-empty bucket with mean (default), min, max, last, count, sum
+     or mode (the most frequent value, also for categorical variables).
+   - Example: resample test-object temperature 1h mean
+
+- get-plot-data <object_name> <variable_name> <plot_type> [--window <samples|duration>]
+                [--resample <interval>] [--aggregation mean] [--bins fixed]
+                [--format json|jsonl|csv|npy] [--out <file>] [--start <time>] [--end <time>]
+                [--columns x,y,...]
    - Retrieve data for a given variable of an object, suitable for plotting.
-   - Supported plot types: 'time_series', 'distribution'
-   - Example: get-plot-data temperature value time_series
+   - Supported plot types: 'time series', 'distribution', 'rolling'
+   - 'rolling' gives the moving mean (with std, min and max) over the last N samples
+     (--window 20, the default) or a trailing duration (--window 15m, 1h, 1d, 1w).
+   - Example: get-plot-data temperature value "time series"
+   - --resample buckets a time series (see resample).
+   - --bins sets the distribution's bins: fixed (width from the resolution, default),
+     fd (Freedman-Diaconis), sturges or quantile (equally filled bins). Fixed bins widen
+     by powers of 10 when the resolution would give more than 500 of them.
+   - Example: get-plot-data temperature value rolling --window 1h
+   - The output options stream the plot as a table, as for get-variable-data: columns x, y,
+     the extra series (e.g. std, min, max) and width for bars; --start/--end need a time axis.
+
+- forecast-all [--method linear] [--horizon 7d] [--step 1d] [--resample <interval>] [--out <file>]
+   - Linear (or quadratic) forecasts of every numeric variable of every object, from the
+     latest sample to the horizon, as CSV rows: object, variable, time, value.
+   - Variables sampled at the same times (or resampled onto the same buckets with
+     --resample) are fitted together in one batched least-squares solve.
+   - Example: forecast-all --method quadratic --horizon 30d --resample 1d --out forecast.csv
+
+- cache-stats
+   - Shows the size and hit/miss counters of the stats and plot-data cache.
+   - Counters cover the running application only: a one-shot CLI call starts empty.
 
 - help
    - Displays this help message.
@@ -0,0 +1,306 @@
+import datetime
+import heapq
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Deque
+
+from domain import Event, Observable, Property, Record
+from infrastructure.processing.file_watcher import FileWatcher
+
+
+class BatchWriter:
+    """Buffers events and writes them through the App in group commits."""
+
+    def __init__(self, app, batch_size: int = 50, flush_interval: float = 10.0):
+        self.app = app
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval  # in seconds
+        self._buffer: List[Event] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.written = 0
+
+    def add(self, event: Event) -> None:
+        with self._lock:
+            self._buffer.append(event)
+        if self.is_due():
+            self.flush()
+
+    def is_due(self) -> bool:
+        with self._lock:
+            if not self._buffer:
+                return False
+            return (len(self._buffer) >= self.batch_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval)
+
+    def seconds_until_due(self) -> float:
+        return max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+
+    def flush(self) -> int:
+        """Write all buffered events in a single repository commit. Returns the number written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._last_flush = time.monotonic()
+        if batch:
+            self.app.commit_events(batch)
+            self.written += len(batch)
+        return len(batch)
+
+    def close(self) -> int:
+        """Write the remaining events and the model snapshot, e.g. on shutdown."""
+        written = self.flush()
+        self.app.save_snapshot()
+        return written
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+
+class SamplingSchedule:
+    """Sampling period of one observable, with jitter and exponential backoff on failures."""
+
+    def __init__(self, observable: Observable, interval: float, jitter: float = 0.1, max_backoff: float = 3600.0):
+        self.observable = observable
+        self.interval = interval
+        self.jitter = jitter
+        self.max_backoff = max(max_backoff, interval)
+        self.failures: int = 0
+        self.next_due: float = 0.0
+
+    def period(self) -> float:
+        """Current period: the base interval, doubled for every consecutive failure."""
+        return min(self.interval * (2 ** self.failures), self.max_backoff)
+
+    def observe(self, state: List[Property]) -> None:
+        """Hook called with every successfully fetched state, before rescheduling."""
+        pass
+
+    def reschedule(self, now: float, success: bool) -> None:
+        self.failures = 0 if success else self.failures + 1
+        spread = random.uniform(-self.jitter, self.jitter)
+        self.next_due = now + self.period() * (1 + spread)
+
+
+class AdaptiveSchedule(SamplingSchedule):
+    """
+    Sampling schedule whose interval follows the variability of the observable's numeric variables.
+
+    The variability score of a fetch is the largest, over all numeric variables, of the coefficient
+    of variation of their last `window` values and of their relative change since the previous
+    fetch. Above `threshold` the interval is divided by `factor`; below `threshold * calm_ratio`
+    it is multiplied by it. The interval always stays within [min_interval, max_interval].
+    """
+
+    def __init__(
+            self,
+            observable: Observable,
+            interval: float,
+            min_interval: float,
+            max_interval: float,
+            threshold: float = 0.05,
+            factor: float = 2.0,
+            window: int = 10,
+            calm_ratio: float = 0.25,
+            jitter: float = 0.1,
+            max_backoff: float = 3600.0,
+    ):
+        super().__init__(observable, min(max(interval, min_interval), max_interval), jitter, max_backoff)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.threshold = threshold
+        self.factor = factor
+        self.calm_ratio = calm_ratio
+        self.window = window
+        self._history: Dict[str, Deque[float]] = {}
+
+    def variability(self, state: List[Property]) -> Optional[float]:
+        """Score the latest state against the recent history; None if there is nothing numeric to judge."""
+        score = None
+        for prop in state:
+            value = prop.value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            history = self._history.setdefault(prop.name, deque(maxlen=self.window))
+            previous = history[-1] if history else None
+            history.append(float(value))
+            if previous is None:
+                continue
+
+            scale = abs(statistics.fmean(history)) or 1.0
+            change_rate = abs(value - previous) / (abs(previous) or scale)
+            spread = statistics.pstdev(history) / scale
+            score = max(score or 0.0, change_rate, spread)
+        return score
+
+    def observe(self, state: List[Property]) -> None:
+        score = self.variability(state)
+        if score is None:
+            return
+        if score > self.threshold:
+            self.interval = max(self.min_interval, self.interval / self.factor)
+        elif score < self.threshold * self.calm_ratio:
+            self.interval = min(self.max_interval, self.interval * self.factor)
+        self.max_backoff = max(self.max_backoff, self.interval)
+
+
+class Collector:
+    """
+    Keeps an App resident and samples each observable on its own schedule.
+
+    Observables falling due within `coalesce_window` seconds of each other are fetched in the
+    same tick and stored as a single event, and events reach the repository in batches through
+    a BatchWriter, so CPU wake-ups and disk writes stay flat as the number of observables grows.
+
+    With `adaptive=True` every observable gets an AdaptiveSchedule bounded by min/max_interval,
+    and `fetch_budget` (fetches per second across all observables) stretches the periods
+    whenever the adaptive intervals together would exceed it.
+
+    With `watch=True` local JSON observables leave the timed schedule and are sampled only
+    when a FileWatcher (inotify if available, stat polling every `poll_interval` otherwise)
+    reports that their file changed.
+    """
+
+    def __init__(
+            self,
+            app,
+            default_interval: float = 60.0,
+            jitter: float = 0.1,
+            coalesce_window: float = 1.0,
+            batch_size: int = 50,
+            flush_interval: float = 10.0,
+            max_backoff: float = 3600.0,
+            workers: int = 4,
+            adaptive: bool = False,
+            min_interval: float = 1.0,
+            max_interval: float = 3600.0,
+            threshold: float = 0.05,
+            fetch_budget: Optional[float] = None,
+            watch: bool = False,
+            poll_interval: float = 1.0,
+    ):
+        self.app = app
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.coalesce_window = coalesce_window
+        self.max_backoff = max_backoff
+        self.workers = workers
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.threshold = threshold
+        self.fetch_budget = fetch_budget
+        self.poll_interval = poll_interval
+        self.writer = BatchWriter(app, batch_size, flush_interval)
+        self.schedules: List[SamplingSchedule] = []
+        self.watched: Dict[str, SamplingSchedule] = {}
+        for observable in app.list_observables():
+            schedule = self.make_schedule(observable)
+            if watch and observable.is_json_file:
+                self.watched[str(Path(observable.source).resolve())] = schedule
+            else:
+                self.schedules.append(schedule)
+
+    def make_schedule(self, observable: Observable) -> SamplingSchedule:
+        interval = observable.interval or self.default_interval
+        if self.adaptive:
+            return AdaptiveSchedule(
+                observable, interval, self.min_interval, self.max_interval,
+                threshold=self.threshold, jitter=self.jitter, max_backoff=self.max_backoff,
+            )
+        return SamplingSchedule(observable, interval, self.jitter, self.max_backoff)
+
+    def fetch_rate(self) -> float:
+        """Expected fetches per second with the current intervals."""
+        return sum(1.0 / schedule.interval for schedule in self.schedules)
+
+    def _apply_budget(self, schedule: SamplingSchedule, now: float) -> None:
+        if self.fetch_budget is None:
+            return
+        rate = self.fetch_rate()
+        if rate > self.fetch_budget:
+            schedule.next_due = now + (schedule.next_due - now) * rate / self.fetch_budget
+
+    def run(self, stop: Optional[threading.Event] = None) -> None:
+        stop = stop or threading.Event()
+        queue: List[Tuple[float, int, SamplingSchedule]] = []
+        start = time.monotonic()
+        for seq, schedule in enumerate(self.schedules):
+            # Spread the first samples over one jitter span instead of firing them all at once
+            schedule.next_due = start + random.uniform(0, self.jitter) * schedule.interval
+            heapq.heappush(queue, (schedule.next_due, seq, schedule))
+
+        watcher = FileWatcher.create(self.watched) if self.watched else None
+
+        print(f"Collector started: {len(self.schedules)} scheduled, {len(self.watched)} watched observables.")
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                if watcher:
+                    # Baseline sample; afterwards watched files are only sampled when they change
+                    self.tick(list(self.watched.values()), pool)
+
+                while not stop.is_set():
+                    if watcher:
+                        changed = [self.watched[path] for path in watcher.changed() if path in self.watched]
+                        if changed:
+                            self.tick(changed, pool)
+
+                    now = time.monotonic()
+                    wait = queue[0][0] - now if queue else self.writer.flush_interval
+                    if watcher:
+                        wait = min(wait, self.poll_interval)
+                    if wait > 0:
+                        stop.wait(min(wait, self.writer.seconds_until_due() or wait))
+                        if self.writer.is_due():
+                            self.writer.flush()
+                        continue
+
+                    due: List[Tuple[int, SamplingSchedule]] = []
+                    while queue and queue[0][0] <= now + self.coalesce_window:
+                        _, seq, schedule = heapq.heappop(queue)
+                        due.append((seq, schedule))
+
+                    self.tick([schedule for _, schedule in due], pool)
+                    for seq, schedule in due:
+                        heapq.heappush(queue, (schedule.next_due, seq, schedule))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if watcher:
+                watcher.close()
+            written = self.writer.close()
+            print(f"Collector stopped ({written} pending events written).")
+
+    def tick(self, schedules: List[SamplingSchedule], pool: ThreadPoolExecutor) -> Optional[Event]:
+        """Fetch all due observables concurrently and buffer their states as one event."""
+        timestamp = datetime.datetime.now(datetime.timezone.utc)
+        futures = [(schedule, pool.submit(schedule.observable.fetch_state, True)) for schedule in schedules]
+
+        records: List[Record] = []
+        for schedule, future in futures:
+            try:
+                state = future.result()
+                success = True
+            except Exception as e:
+                state = None
+                success = False
+                print(f"Failed to sample {schedule.observable.name} "
+                      f"(attempt {schedule.failures + 1}): {e}")
+
+            if success:
+                schedule.observe(state)
+                records.append(Record(schedule.observable.name, state))
+            now = time.monotonic()
+            schedule.reschedule(now, success)
+            self._apply_budget(schedule, now)
+
+        if not records:
+            return None
+
+        event = Event(records, timestamp)
+        self.writer.add(event)
+        return event
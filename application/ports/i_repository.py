@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from domain.event import Event
 from domain.observable import Observable
@@ -20,3 +20,20 @@ class IRepository(ABC):
 
     def save_events(self, data: List[Event]) -> None:
         pass
+
+    def append_events(self, data: List[Event]) -> None:
+        """Persist a batch of new events. Repositories able to append natively should override this."""
+        events = self.load_events()
+        events.extend(data)
+        self.save_events(events)
+
+    def load_snapshot(self) -> Optional[dict]:
+        """Load the persisted model snapshot, if the repository keeps one."""
+        return None
+
+    def save_snapshot(self, snapshot: dict) -> None:
+        pass
+
+    def version(self) -> Optional[tuple]:
+        """A token that changes whenever the stored data changes (None when unknown)."""
+        return None
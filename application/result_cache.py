@@ -0,0 +1,100 @@
+from __future__ import annotations
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import is_dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def approximate_size(obj: Any, depth: int = 3) -> int:
+    """Rough memory footprint in bytes of a result (containers, arrays and dataclasses are followed a few levels deep)."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes + 112
+    size = sys.getsizeof(obj)
+    if depth == 0:
+        return size
+    if isinstance(obj, dict):
+        items = list(obj.items())
+        sample = items[:64]
+        if sample:
+            per_item = sum(approximate_size(k, depth - 1) + approximate_size(v, depth - 1) for k, v in sample) / len(sample)
+            size += int(per_item * len(items))
+    elif isinstance(obj, (list, tuple, set)):
+        items = list(obj)
+        sample = items[:64]
+        if sample:
+            size += int(sum(approximate_size(v, depth - 1) for v in sample) / len(sample) * len(items))
+    elif is_dataclass(obj):
+        size += sum(approximate_size(v, depth - 1) for v in vars(obj).values())
+    return size
+
+
+class ResultCache:
+    """
+    LRU cache of computed results (stats, plot data, extrapolations), bounded both in number of
+    entries and in approximate memory. Keys carry the data version of the variable they were
+    computed from, so an ingestion makes older entries unreachable and they age out.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        if self.max_entries <= 0:
+            return value
+        size = approximate_size(value)
+        with self._lock:
+            if self.max_bytes is not None and size > self.max_bytes:
+                return value
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,64 @@
+"""
+Benchmark of the residual bootstrap behind forecast prediction bands.
+
+A noisy linear series of --samples points is fitted, then --resamples bootstrap resamples are
+drawn over a --grid-point forecast grid, once with ResidualBootstrap (batched draws, refits as
+one matrix product) and once with a loop of `random`-based draws and per-resample polyfit
+calls, the way RangeDomain.generate_random_sample draws values. Both bands are printed.
+
+    python -m benchmarks.bootstrap --samples 5000 --resamples 2000 --grid 500
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from domain.bootstrap import ResidualBootstrap
+from domain.regression import PolynomialFit
+
+
+def loop_bands(timestamps, values, fit, grid, resamples, confidence):
+    u = (timestamps - fit.center) / fit.unit
+    grid_u = (grid - fit.center) / fit.unit
+    fitted = fit(timestamps)
+    n, size = len(values), len(fit.coeffs)
+    residuals = ((values - fitted - (values - fitted).mean()) * np.sqrt(n / (n - size))).tolist()
+    simulated = []
+    for _ in range(resamples):
+        drawn = np.array([random.choice(residuals) for _ in range(len(residuals))])
+        coeffs = np.polyfit(u, fitted + drawn, size - 1)
+        noise = np.array([random.choice(residuals) for _ in range(len(grid))])
+        simulated.append(np.polyval(coeffs, grid_u) + noise)
+    tail = (1 - confidence) / 2
+    return np.quantile(np.array(simulated), [tail, 1 - tail], axis=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=5000)
+    parser.add_argument("--resamples", type=int, default=2000)
+    parser.add_argument("--grid", type=int, default=500)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    timestamps = np.sort(rng.uniform(1.7e9, 1.7e9 + 30 * 86400, args.samples))
+    values = 0.5 + 1e-5 * (timestamps - 1.7e9) + rng.normal(0, 2, args.samples)
+    fit = PolynomialFit.fit(timestamps, values, 1)
+    grid = np.linspace(timestamps[-1], timestamps[-1] + 7 * 86400, args.grid)
+
+    bands = ResidualBootstrap.bands(timestamps, values, fit, grid, args.resamples, args.confidence, seed=0)
+    print(f"{args.samples} samples, {args.resamples} resamples, {args.grid} grid points\n")
+    print(f"vectorized : {bands.seconds * 1e3:9.1f} ms   "
+          f"band at horizon [{bands.lower[-1]:.3f}, {bands.upper[-1]:.3f}]")
+
+    start = time.perf_counter()
+    lower, upper = loop_bands(timestamps, values, fit, grid, args.resamples, args.confidence)
+    elapsed = time.perf_counter() - start
+    print(f"python loop: {elapsed * 1e3:9.1f} ms   band at horizon [{lower[-1]:.3f}, {upper[-1]:.3f}]")
+    print(f"\nspeedup: {elapsed / bands.seconds:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
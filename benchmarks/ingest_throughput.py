@@ -0,0 +1,130 @@
+"""
+Throughput benchmark for the push ingestion endpoint.
+
+Starts an IngestServer on an ephemeral localhost port, backed by a JsonRepository in a temporary
+directory, and drives it with a local load generator: several producer threads posting JSON-lines
+batches of readings over keep-alive connections, retrying on 503 as a real producer would.
+
+The repository is first seeded with --history stored events, and the load is sent in --rounds
+successive rounds, so that the table shows whether throughput holds as the store grows.
+
+    python -m benchmarks.ingest_throughput --producers 4 --requests 200 --readings 50 --history 100000
+"""
+import argparse
+import datetime
+import http.client
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from application.app import App
+from domain import Event, Property, Record
+from infrastructure.persistence.json_repository import JsonRepository
+from interface.ingest.ingest_server import IngestServer
+
+
+def make_state() -> list:
+    return [
+        {"name": "temperature", "value": random.uniform(15.0, 30.0)},
+        {"name": "humidity", "value": random.randint(20, 90)},
+        {"name": "status", "value": random.choice(["ok", "warning", "critical"])},
+    ]
+
+
+def make_body(readings: int, producer: int) -> bytes:
+    lines = []
+    for _ in range(readings):
+        lines.append(json.dumps({"observable": f"sensor_{producer}", "state": make_state()}))
+    return "\n".join(lines).encode("utf-8")
+
+
+def seed(repository: JsonRepository, events: int, producers: int) -> None:
+    """Store a history of readings like those the producers send, one second apart."""
+    start = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=events)
+    repository.save_events([
+        Event(
+            [Record(f"sensor_{i % producers}", [Property(p["name"], p["value"]) for p in make_state()])],
+            start + datetime.timedelta(seconds=i),
+        )
+        for i in range(events)
+    ])
+
+
+def producer(port: int, producer_id: int, requests: int, readings: int, stats: dict, lock: threading.Lock):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Content-Type": "application/x-ndjson"}
+    sent = retries = 0
+    for _ in range(requests):
+        body = make_body(readings, producer_id)
+        while True:
+            conn.request("POST", "/events", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status == 202:
+                sent += readings
+                break
+            if response.status != 503:
+                raise RuntimeError(f"Unexpected status {response.status}")
+            retries += 1
+            time.sleep(0.01)
+    conn.close()
+    with lock:
+        stats["sent"] += sent
+        stats["retries"] += retries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200, help="requests per producer")
+    parser.add_argument("--readings", type=int, default=50, help="readings per request")
+    parser.add_argument("--batch-size", type=int, default=5000, help="events per group commit")
+    parser.add_argument("--queue-size", type=int, default=20000)
+    parser.add_argument("--history", type=int, default=100000, help="events stored before the first round")
+    parser.add_argument("--rounds", type=int, default=3, help="load rounds, each on top of the previous ones")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = JsonRepository(Path(tmp) / "observables.json", Path(tmp) / "events.json")
+        seed(repository, args.history, args.producers)
+        app = App(repository)
+        server = IngestServer(app, port=0, batch_size=args.batch_size, flush_interval=0.5,
+                              queue_size=args.queue_size)
+        port = server.httpd.server_address[1]
+        server.start()
+
+        print(f"producers: {args.producers}, {args.requests} requests x {args.readings} readings each per round\n")
+        print(f"{'round':>5}{'stored before':>15}{'accept (readings/s)':>22}{'end-to-end (readings/s)':>26}{'503 retries':>13}")
+        for round_number in range(1, args.rounds + 1):
+            stored_before = len(app.events)
+            stats = {"sent": 0, "retries": 0}
+            lock = threading.Lock()
+            threads = [
+                threading.Thread(target=producer, args=(port, i, args.requests, args.readings, stats, lock))
+                for i in range(args.producers)
+            ]
+
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            accepted_at = time.perf_counter()
+            # End to end: until the writer thread has committed every reading of the round
+            while len(app.events) < stored_before + stats["sent"]:
+                time.sleep(0.005)
+            written_at = time.perf_counter()
+
+            total = stats["sent"]
+            print(f"{round_number:>5}{stored_before:>15,}{total / (accepted_at - start):>22,.0f}"
+                  f"{total / (written_at - start):>26,.0f}{stats['retries']:>13}")
+
+        server.shutdown()
+        print(f"\nevents stored: {len(repository.load_events()):,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Microbenchmark of the JSON codec backends on the shape of our real events.json.
+
+The events stored in infrastructure/database/events.json are replicated (with shifted
+timestamps) up to --events entries, then decoded and encoded with every installed backend,
+compact and indented, next to the previous stdlib `indent=4` baseline.
+
+    python -m benchmarks.json_codec --events 20000 --repeat 5
+"""
+import argparse
+import datetime
+import json
+import time
+
+from infrastructure.environment.environment import Env
+from infrastructure.processing.json_codec import JsonCodec
+
+
+def build_events(count: int) -> list:
+    with open(Env.get_events_file_path(), "rb") as f:
+        template = json.loads(f.read())
+    if not template:
+        raise SystemExit("events.json is empty; nothing to replicate.")
+
+    start = datetime.datetime.fromisoformat(template[0]["timestamp"])
+    events = []
+    for i in range(count):
+        event = dict(template[i % len(template)])
+        event["timestamp"] = (start + datetime.timedelta(minutes=i)).isoformat()
+        events.append(event)
+    return events
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    events = build_events(args.events)
+    baseline_text = json.dumps(events, indent=4)
+    print(f"{args.events} events, {len(baseline_text) / 1e6:.1f} MB as indent=4 JSON\n")
+    print(f"{'backend':<22}{'encode (ms)':>12}{'decode (ms)':>12}{'size (MB)':>11}")
+
+    encode = best_of(args.repeat, lambda: json.dumps(events, indent=4))
+    decode = best_of(args.repeat, lambda: json.loads(baseline_text))
+    print(f"{'json indent=4 (old)':<22}{encode * 1e3:>12.1f}{decode * 1e3:>12.1f}{len(baseline_text) / 1e6:>11.2f}")
+
+    selected = JsonCodec.backend
+    try:
+        for backend in JsonCodec.available_backends():
+            JsonCodec.use(backend)
+            for pretty in (False, True):
+                data = JsonCodec.dumpb(events, pretty=pretty)
+                encode = best_of(args.repeat, lambda: JsonCodec.dumpb(events, pretty=pretty))
+                decode = best_of(args.repeat, lambda: JsonCodec.loads(data))
+                label = f"{backend} {'pretty' if pretty else 'compact'}"
+                print(f"{label:<22}{encode * 1e3:>12.1f}{decode * 1e3:>12.1f}{len(data) / 1e6:>11.2f}")
+    finally:
+        JsonCodec.use(selected)
+
+    print(f"\ndefault backend: {selected}")
+
+
+if __name__ == "__main__":
+    main()
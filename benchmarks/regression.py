@@ -0,0 +1,84 @@
+"""
+Equivalence check of the streaming regression sums against direct least squares.
+
+Builds variables whose samples go through VariableData (so through RegressionAccumulator.add, and
+.remove for overwritten timestamps), including series with a single early sample followed by data
+years later, and compares the linear and quadratic fits of variable.data.regression with
+PolynomialFit.fit and np.polyfit on the same arrays, over the data and a week of forecast. A fit
+matches when its largest difference stays within --tolerance of the largest fitted magnitude.
+Exits with status 1 on any mismatch.
+
+    python -m benchmarks.regression --size 5000
+"""
+import argparse
+import datetime
+import sys
+import time
+
+import numpy as np
+
+from domain import Variable
+from domain.regression import FIT_METHODS, PolynomialFit
+
+EPOCH = datetime.datetime(2016, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_variable(timestamps: np.ndarray, values: np.ndarray, overwrites: int = 0) -> Variable:
+    """A variable holding the samples, the first `overwrites` of them first stored with other values."""
+    variable = Variable(name="series")
+    for t, value in zip(timestamps[:overwrites], values[:overwrites]):
+        variable.data[EPOCH + datetime.timedelta(seconds=float(t) - EPOCH.timestamp())] = float(value) + 1e3
+    for t, value in zip(timestamps, values):
+        variable.data[EPOCH + datetime.timedelta(seconds=float(t) - EPOCH.timestamp())] = float(value)
+    return variable
+
+
+def cases(size: int, rng: np.random.Generator) -> list:
+    start = EPOCH.timestamp()
+    hour = np.arange(0.0, 3600.0, 3600.0 / size)
+    regular = start + np.sort(rng.uniform(0, 30 * 86400, size))
+    result = [
+        ("regular, 30 days", regular, np.sin(regular / 86400) + (regular - start) / 86400 * 0.1, 0),
+        ("regular, overwritten", regular, 50 + rng.normal(0, 1, size), size // 2),
+    ]
+    for years in (1, 3, 10, 30):
+        # One early sample, then an hour of data `years` later
+        timestamps = np.concatenate([[start], start + years * 365 * 86400 + hour])
+        values = 2e5 + 0.01 * (timestamps - timestamps[-1]) + rng.normal(0, 5, len(timestamps))
+        result.append((f"gap of {years} years", timestamps, values, 0))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--tolerance", type=float, default=5e-7, help="relative to the largest fitted value")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    mismatches = 0
+    print(f"{'series':<24}{'method':<11}{'vs PolynomialFit.fit':>22}{'vs np.polyfit':>16}{'add (µs)':>10}")
+    for label, timestamps, values, overwrites in cases(args.size, rng):
+        started = time.perf_counter()
+        variable = make_variable(timestamps, values, overwrites)
+        elapsed = (time.perf_counter() - started) / (len(timestamps) + overwrites)
+        grid = np.linspace(timestamps[-1] - (timestamps[-1] - timestamps[1]), timestamps[-1] + 7 * 86400, 200)
+        center = timestamps.mean()
+        for method, degree in FIT_METHODS.items():
+            streamed = variable.data.regression.fit(degree)(grid)
+            direct = PolynomialFit.fit(timestamps, values, degree)(grid)
+            polyfit = np.polyval(np.polyfit(timestamps - center, values, degree), grid - center)
+            scale = np.abs(direct).max() or 1.0
+            errors = [np.abs(streamed - direct).max() / scale, np.abs(streamed - polyfit).max() / scale]
+            failed = max(errors) > args.tolerance
+            mismatches += failed
+            print(f"{label:<24}{method:<11}{errors[0]:>22.2e}{errors[1]:>16.2e}{elapsed * 1e6:>10.1f}"
+                  + ("   MISMATCH" if failed else ""))
+
+    print(f"\n{mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
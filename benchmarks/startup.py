@@ -0,0 +1,122 @@
+"""
+Cold-start benchmark of the CLI, one fresh interpreter per command.
+
+Every read-only CLI command is run --repeat times as `python -X importtime main.py ...`
+against the real repository (the first numeric and the first categorical variable are used
+where a command needs one). For each command the table shows the best wall time, the time
+spent importing modules (from the -X importtime report), and the heaviest root packages
+imported, so that a command starting to pull in numpy, requests or the GUI stack shows up.
+
+    python -m benchmarks.startup --repeat 5
+"""
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from infrastructure.environment.environment import Env
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def pick_variables() -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """(object, variable) of the first numeric and of the first categorical variable."""
+    from application.app import App
+    from infrastructure.persistence.json_repository import JsonRepository
+
+    numeric = categorical = None
+    for obj in App(JsonRepository()).model.objects:
+        for name, variable in obj.variables.items():
+            if not len(variable.data):
+                continue
+            if variable.data.value_kind() == "object":
+                categorical = categorical or (obj.name, name)
+            else:
+                numeric = numeric or (obj.name, name)
+    if numeric is None:
+        raise SystemExit("The repository has no numeric variable to query.")
+    return numeric, categorical or numeric
+
+
+def commands() -> List[List[str]]:
+    (obj, var), (cat_obj, cat_var) = pick_variables()
+    return [
+        ["help"],
+        ["list-observables"],
+        ["list-objects"],
+        ["list-scripts"],
+        ["list-variables", obj],
+        ["compute-stats-values", cat_obj, cat_var],
+        ["compute-stats-window", obj, var, "-", "-"],
+        ["compute-percentiles", obj, var],
+        ["compute-top-values", cat_obj, cat_var],
+        ["get-variable-data", obj, var],
+        ["get-plot-data", obj, var, "time series"],
+        ["get-plot-data", obj, var, "distribution"],
+        ["resample", obj, var, "1d"],
+        ["forecast-all", "--horizon", "1d"],
+        ["cache-stats"],
+    ]
+
+
+def parse_importtime(report: str) -> Tuple[float, Dict[str, float]]:
+    """Total import time and cumulative time per root package, in seconds."""
+    total = 0.0
+    roots: Dict[str, float] = defaultdict(float)
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        seconds = int(cumulative) / 1e6
+        depth = len(name) - len(name.lstrip(" "))
+        module = name.strip()
+        if depth == 1:
+            total += seconds
+        if "." not in module and not module.startswith("_"):
+            roots[module] = max(roots[module], seconds)
+    return total, roots
+
+
+def run(args: List[str]) -> Tuple[float, float, Dict[str, float]]:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode:
+        print(f"  {' '.join(args)} failed:\n{completed.stderr[-500:]}")
+    total, roots = parse_importtime(completed.stderr)
+    return elapsed, total, roots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=3, help="heaviest root packages listed per command")
+    args = parser.parse_args()
+
+    if Env.get_socket_path().exists():
+        print(f"Note: {Env.get_socket_path()} exists; if `serve` is running, commands are forwarded to it.\n")
+
+    print(f"{'command':<36}{'wall (ms)':>10}{'imports (ms)':>14}   heaviest imports (ms)")
+    for command in commands():
+        best = None
+        for _ in range(args.repeat):
+            result = run(command)
+            if best is None or result[0] < best[0]:
+                best = result
+        elapsed, imports, roots = best
+        heaviest = sorted(roots.items(), key=lambda item: -item[1])[:args.top]
+        label = " ".join(f'"{arg}"' if " " in arg else arg for arg in command)
+        print(f"{label[:35]:<36}{elapsed * 1e3:>10.0f}{imports * 1e3:>14.0f}   "
+              + ", ".join(f"{name} {seconds * 1e3:.0f}" for name, seconds in heaviest))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Equivalence check and timings of the NumPy stats engine against StatsAnalyzer.
+
+Builds synthetic variables (ints, floats, mixed numbers, categorical strings, strings mixed with
+numbers) plus every variable of the current model, runs StatsAnalyzer.compute and
+VectorStatsAnalyzer.compute on a set of Range/Enumeration domains, and compares the Stats field
+by field: exactly, except mean/std of float series which are compared with a relative tolerance.
+Exits with status 1 on any mismatch.
+
+    python -m benchmarks.stats_engine --size 20000
+"""
+import argparse
+import datetime
+import math
+import random
+import sys
+import time
+
+from domain import EnumerationDomain, RangeDomain, StatsAnalyzer, Variable, VectorStatsAnalyzer
+
+
+def make_variable(name: str, values: list) -> Variable:
+    variable = Variable(name=name)
+    start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    for i, value in enumerate(values):
+        variable.data[start + datetime.timedelta(seconds=i)] = value
+    return variable
+
+
+def synthetic_variables(size: int, rng: random.Random) -> list:
+    return [
+        make_variable("ints", [rng.randint(-50, 50) for _ in range(size)]),
+        make_variable("floats", [rng.gauss(20.0, 5.0) for _ in range(size)]),
+        make_variable("rounded floats", [round(rng.uniform(0, 10), 1) for _ in range(size)]),
+        make_variable("mixed numbers", [rng.choice([rng.randint(0, 9), rng.random() * 10]) for _ in range(size)]),
+        make_variable("status", [rng.choice(["ok", "warning", "critical"]) for _ in range(size)]),
+        make_variable("ids", [f"id-{rng.randint(0, size)}" for _ in range(size)]),
+        make_variable("strings and numbers", [rng.choice(["n/a", rng.randint(0, 5), 2.5]) for _ in range(size)]),
+    ]
+
+
+def domains_for(variable: Variable, rng: random.Random) -> list:
+    values = list(variable.data.values())
+    numeric = [v for v in values if isinstance(v, (int, float))]
+    distinct = variable.data.all_values()
+    domains = [EnumerationDomain(distinct), EnumerationDomain(rng.sample(distinct, max(1, len(distinct) // 3)))]
+    if numeric:
+        lo, hi = min(numeric), max(numeric)
+        domains += [RangeDomain(lo, hi), RangeDomain(lo + (hi - lo) / 4, hi - (hi - lo) / 4)]
+    return domains
+
+
+def same(field: str, a, b) -> bool:
+    if field in ("mean", "std") and (isinstance(a, float) or isinstance(b, float)):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b and type(a) is type(b)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="values per synthetic variable")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-model", action="store_true", help="skip the variables of the stored model")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    variables = synthetic_variables(args.size, rng)
+    if not args.no_model:
+        from application.app import App
+        from infrastructure.persistence.json_repository import JsonRepository
+        app = App(JsonRepository())
+        variables += [v for obj in app.model.objects for v in obj.variables.values()]
+
+    mismatches = 0
+    print(f"{'variable':<24}{'domain':<22}{'python (ms)':>12}{'numpy (ms)':>12}{'speed-up':>10}")
+    for variable in variables:
+        variable.data.columns()
+        variable.data.codes()  # column views are built once per version, outside the timed region
+        for domain in domains_for(variable, rng):
+            start = time.perf_counter()
+            expected = StatsAnalyzer.compute(variable, domain)
+            reference = time.perf_counter() - start
+
+            start = time.perf_counter()
+            actual = VectorStatsAnalyzer.compute(variable, domain)
+            vectorized = time.perf_counter() - start
+
+            for field in expected.__dict__:
+                if field == "percentiles":
+                    continue  # not computed by StatsAnalyzer.compute
+                a, b = getattr(expected, field), getattr(actual, field)
+                if not same(field, a, b):
+                    mismatches += 1
+                    print(f"MISMATCH {variable.name}/{type(domain).__name__}.{field}: {a!r} != {b!r}")
+
+            label = type(domain).__name__.replace("Domain", "")
+            if isinstance(domain, EnumerationDomain):
+                label += f" ({len(domain.values)})"
+            speedup = reference / vectorized if vectorized else float("inf")
+            print(f"{variable.name[:23]:<24}{label:<22}{reference * 1e3:>12.2f}{vectorized * 1e3:>12.2f}{speedup:>9.1f}x")
+
+    print(f"\n{mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,8 @@ from .property import Property
 from .record import Record
 from .stats import Stats, StatsAnalyzer
 from .variable import Variable, VariableData
+from .vector_stats import VectorStatsAnalyzer
+from .window_index import WindowIndex
 
 __all__ = [
     "RangeDomain", "EnumerationDomain",
@@ -21,4 +23,6 @@ __all__ = [
     "Record",
     "Stats", "StatsAnalyzer",
     "Variable", "VariableData",
+    "VectorStatsAnalyzer",
+    "WindowIndex",
 ]
@@ -0,0 +1,231 @@
+from __future__ import annotations
+from bisect import bisect_left, insort
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from domain.heavy_hitters import HeavyHitters
+from domain.sketch import TDigest
+
+ValueType = Union[int, float, str]
+
+
+class StatsAccumulator:
+    """
+    Streaming whole-history statistics of one variable, updated value by value.
+
+    Keeps the count, Welford mean/M2 and min/max of the numeric values, and the count of every
+    distinct value, plus a t-digest of the numeric values for approximate percentiles. The sorted
+    numeric values needed for the exact median are an extra structure that is built on first use
+    and then maintained incrementally. Removals (a timestamp overwritten with a new value) are
+    folded out exactly, except for min/max and the digest which become stale and are recomputed
+    from the values on the next read.
+
+    Once a variable has more than `cardinality_threshold` distinct values, the frequencies dict
+    is replaced by a fixed-memory HeavyHitters summary: the mode and top values then become
+    estimates with error bounds (see top()).
+    """
+
+    # t-digest compression of new accumulators: higher is more accurate and larger
+    default_compression: float = 100.0
+    # Distinct values above which exact frequencies give way to heavy-hitter sketches
+    cardinality_threshold: int = 10000
+    heavy_hitters_capacity: int = 256
+
+    def __init__(self, compression: Optional[float] = None) -> None:
+        self.count: int = 0
+        self.numeric_count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.frequencies: Dict[ValueType, int] = {}
+        self._sorted: Optional[List[float]] = None
+        self._extrema_stale: bool = False
+        self.digest: TDigest = TDigest(compression or self.default_compression)
+        self._digest_stale: bool = False
+        self.heavy_hitters: Optional[HeavyHitters] = None
+
+    @staticmethod
+    def is_numeric(value) -> bool:
+        return isinstance(value, (int, float))
+
+    @property
+    def all_numeric(self) -> bool:
+        return self.count > 0 and self.numeric_count == self.count
+
+    @property
+    def approximate(self) -> bool:
+        """Whether frequencies, mode and top values are sketched rather than exact."""
+        return self.heavy_hitters is not None
+
+    def _count_value(self, value: ValueType, count: int = 1) -> None:
+        if self.heavy_hitters is not None:
+            self.heavy_hitters.add(value, count)
+            return
+        self.frequencies[value] = self.frequencies.get(value, 0) + count
+        if len(self.frequencies) > self.cardinality_threshold:
+            self.heavy_hitters = HeavyHitters.from_frequencies(self.frequencies, capacity=self.heavy_hitters_capacity)
+            self.frequencies = {}
+
+    def add(self, value: ValueType) -> None:
+        self.count += 1
+        self._count_value(value)
+        if not self.is_numeric(value):
+            return
+
+        self.numeric_count += 1
+        delta = value - self.mean
+        self.mean += delta / self.numeric_count
+        self.m2 += delta * (value - self.mean)
+        if not self._extrema_stale:
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+        if self._sorted is not None:
+            insort(self._sorted, value)
+        if not self._digest_stale:
+            self.digest.add(value)
+
+    def remove(self, value: ValueType) -> None:
+        self.count -= 1
+        if self.heavy_hitters is not None:
+            self.heavy_hitters.remove(value)
+        else:
+            remaining = self.frequencies[value] - 1
+            if remaining:
+                self.frequencies[value] = remaining
+            else:
+                del self.frequencies[value]
+        if not self.is_numeric(value):
+            return
+
+        self.numeric_count -= 1
+        if self.numeric_count == 0:
+            self.mean, self.m2, self.min, self.max = 0.0, 0.0, None, None
+            self._extrema_stale = False
+        else:
+            delta = value - self.mean
+            self.mean -= delta / self.numeric_count
+            self.m2 = max(0.0, self.m2 - delta * (value - self.mean))
+            if value == self.min or value == self.max:
+                self._extrema_stale = True
+        # A t-digest cannot forget a value
+        self._digest_stale = True
+        if self._sorted is not None:
+            del self._sorted[bisect_left(self._sorted, value)]
+
+    def refresh(self, values: Iterable[ValueType]) -> None:
+        """Recompute what is stale (min/max, digest) or not yet built (sorted values) from the current values."""
+        if not self.needs_refresh and self._sorted is not None:
+            return
+        numeric = sorted(v for v in values if self.is_numeric(v))
+        self._sorted = numeric
+        self.min = numeric[0] if numeric else None
+        self.max = numeric[-1] if numeric else None
+        self._extrema_stale = False
+        if self._digest_stale:
+            self.digest = TDigest(self.digest.compression)
+            self.digest.update(numeric)
+            self._digest_stale = False
+
+    @property
+    def needs_refresh(self) -> bool:
+        return self._extrema_stale or self._digest_stale
+
+    def variance(self) -> float:
+        """Sample variance (n - 1), 0.0 for fewer than two values."""
+        return self.m2 / (self.numeric_count - 1) if self.numeric_count > 1 else 0.0
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
+
+    def median(self, values: Iterable[ValueType]) -> Optional[float]:
+        if self._sorted is None:
+            self.refresh(values)
+        n = len(self._sorted)
+        if n == 0:
+            return None
+        mid = n // 2
+        return self._sorted[mid] if n % 2 else (self._sorted[mid - 1] + self._sorted[mid]) / 2
+
+    def percentiles(self, ps: Sequence[float]) -> Dict[float, Optional[float]]:
+        """Approximate percentiles (0..100) of the numeric values, from the digest."""
+        return self.digest.percentiles(ps)
+
+    def mode(self) -> Optional[ValueType]:
+        if self.heavy_hitters is not None:
+            return self.heavy_hitters.mode()
+        return max(self.frequencies.items(), key=lambda x: x[1])[0] if self.frequencies else None
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[ValueType, int, int]]:
+        """
+        The n most frequent values as (value, count, error) by decreasing count, where the true
+        count lies in [count - error, count]. Error is 0 while frequencies are exact.
+        """
+        if self.heavy_hitters is not None:
+            return self.heavy_hitters.top(n)
+        ranked = sorted(self.frequencies.items(), key=lambda x: -x[1])[:n]
+        return [(value, count, 0) for value, count in ranked]
+
+    def merge(self, other: StatsAccumulator) -> None:
+        """Fold another accumulator (e.g. of a later time segment) into this one (Chan et al.)."""
+        n = self.numeric_count + other.numeric_count
+        if other.numeric_count:
+            delta = other.mean - self.mean
+            self.mean += delta * other.numeric_count / n
+            self.m2 += other.m2 + delta * delta * self.numeric_count * other.numeric_count / n
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.numeric_count = n
+        self.count += other.count
+        if self.heavy_hitters is None and other.heavy_hitters is None:
+            for value, count in other.frequencies.items():
+                self._count_value(value, count)
+        else:
+            if self.heavy_hitters is None:
+                self.heavy_hitters = HeavyHitters.from_frequencies(self.frequencies, capacity=self.heavy_hitters_capacity)
+                self.frequencies = {}
+            self.heavy_hitters.merge(
+                other.heavy_hitters
+                or HeavyHitters.from_frequencies(other.frequencies, capacity=self.heavy_hitters.top_k.capacity)
+            )
+        self._sorted = None
+        self._extrema_stale = self._extrema_stale or other._extrema_stale
+        self.digest.merge(other.digest)
+        self._digest_stale = self._digest_stale or other._digest_stale
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "numeric_count": self.numeric_count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "stale": self._extrema_stale,
+            "digest": None if self._digest_stale else self.digest.to_dict(),
+            # JSON objects only have string keys: keep (value, count) pairs to preserve value types
+            "frequencies": [[value, count] for value, count in self.frequencies.items()],
+            "heavy_hitters": self.heavy_hitters.to_dict() if self.heavy_hitters is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> StatsAccumulator:
+        acc = cls()
+        acc.count = data["count"]
+        acc.numeric_count = data["numeric_count"]
+        acc.mean = data["mean"]
+        acc.m2 = data["m2"]
+        acc.min = data["min"]
+        acc.max = data["max"]
+        acc._extrema_stale = data.get("stale", False)
+        acc.frequencies = {value: count for value, count in data["frequencies"]}
+        if data.get("heavy_hitters"):
+            acc.heavy_hitters = HeavyHitters.from_dict(data["heavy_hitters"])
+        if data.get("digest"):
+            acc.digest = TDigest.from_dict(data["digest"])
+        else:
+            # Older snapshots have no digest: rebuild it from the values on first read
+            acc._digest_stale = acc.numeric_count > 0
+        return acc
@@ -0,0 +1,62 @@
+from __future__ import annotations
+import time
+from dataclasses import dataclass
+from typing import Optional
+from domain.lazy import lazy_import
+
+from domain.regression import PolynomialFit
+
+np = lazy_import("numpy")
+
+
+@dataclass
+class PredictionBands:
+    """Lower and upper prediction bounds aligned with a forecast grid, and how they were obtained."""
+    lower: np.ndarray
+    upper: np.ndarray
+    confidence: float
+    resamples: int
+    seconds: float
+
+
+class ResidualBootstrap:
+    """
+    Prediction bands of a least-squares polynomial fit by residual bootstrap.
+
+    Every resample adds residuals drawn with replacement to the fitted values and refits; the
+    refits of a whole batch of resamples are one matrix product with the pseudo-inverse of the
+    design matrix (Y* = fitted + R*, coeffs* = coeffs + pinv(V)·R*). Each refit curve plus a
+    freshly drawn residual is one simulated future value per grid point, and the bands are the
+    empirical quantiles across resamples. Batches are sized so that the residual draws hold at
+    most max_cells values.
+    """
+
+    @staticmethod
+    def bands(timestamps: np.ndarray, values: np.ndarray, fit: PolynomialFit, grid: np.ndarray,
+              resamples: int = 1000, confidence: float = 0.9, seed: Optional[int] = None,
+              max_cells: int = 4_000_000) -> Optional[PredictionBands]:
+        """Bands over the grid, or None with too few samples to have residuals."""
+        started = time.perf_counter()
+        n, size = len(timestamps), len(fit.coeffs)
+        if n <= size or resamples < 1:
+            return None
+
+        design = np.vander((timestamps - fit.center) / fit.unit, size, increasing=True)
+        grid_design = np.vander((np.asarray(grid, dtype=np.float64) - fit.center) / fit.unit, size, increasing=True)
+        residuals = values.astype(np.float64) - design @ fit.coeffs
+        # Residuals understate the noise by the fitted degrees of freedom
+        residuals = (residuals - residuals.mean()) * np.sqrt(n / (n - size))
+        inverse = np.linalg.pinv(design)
+        rng = np.random.default_rng(seed)
+
+        simulated = np.empty((len(grid), resamples))
+        batch = max(1, max_cells // n)
+        for start in range(0, resamples, batch):
+            count = min(batch, resamples - start)
+            coeffs = fit.coeffs[:, None] + inverse @ residuals[rng.integers(0, n, size=(n, count))]
+            noise = residuals[rng.integers(0, n, size=(len(grid), count))]
+            simulated[:, start:start + count] = grid_design @ coeffs + noise
+
+        tail = (1 - confidence) / 2
+        lower, upper = np.quantile(simulated, [tail, 1 - tail], axis=1)
+        return PredictionBands(lower, upper, confidence, resamples, time.perf_counter() - started)
@@ -1,6 +1,10 @@
+from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Union, List
 import random
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
 
 ValueType = Union[int, float, str]
 
@@ -18,6 +22,10 @@ class Domain(ABC):
         """Generate a list of n random values from the domain."""
         pass
 
+    def mask(self, array: np.ndarray) -> np.ndarray:
+        """Boolean array telling, element-wise, whether the values of `array` are in the domain."""
+        return np.fromiter((self.belongs(v) for v in array), dtype=bool, count=len(array))
+
 
 class RangeDomain(Domain):
     """Numeric domain defined by min/max."""
@@ -30,6 +38,11 @@ class RangeDomain(Domain):
     def belongs(self, value: ValueType) -> bool:
         return isinstance(value, (int, float)) and self.min_value <= value <= self.max_value
 
+    def mask(self, array: np.ndarray) -> np.ndarray:
+        if array.dtype.kind in "iuf":
+            return (array >= self.min_value) & (array <= self.max_value)
+        return super().mask(array)
+
     def generate_random_sample(self, n: int) -> List[ValueType]:
         return [random.uniform(self.min_value, self.max_value) for _ in range(n)]
 
@@ -40,9 +53,24 @@ class EnumerationDomain(Domain):
     def __init__(self, values: List[ValueType]):
         super().__init__()
         self.values = values
+        # Membership tests go through a set: O(1) instead of a scan of the list
+        self._lookup = set(values)
 
     def belongs(self, value: ValueType) -> bool:
-        return value in self.values
+        return value in self._lookup
+
+    def mask(self, array: np.ndarray) -> np.ndarray:
+        if array.dtype.kind in "iuf":
+            numeric = [v for v in self.values if isinstance(v, (int, float))]
+            return np.isin(array, np.array(numeric, dtype=np.float64))
+        lookup = self._lookup
+        return np.fromiter((v in lookup for v in array), dtype=bool, count=len(array))
+
+    def mask_codes(self, codes: np.ndarray, uniques: List[ValueType]) -> np.ndarray:
+        """Mask of factorized values: membership is decided once per distinct value, then gathered by code."""
+        lookup = self._lookup
+        allowed = np.fromiter((u in lookup for u in uniques), dtype=bool, count=len(uniques))
+        return allowed[codes]
 
     def generate_random_sample(self, n: int) -> List[ValueType]:
         return random.choices(self.values, k=n)
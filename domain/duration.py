@@ -0,0 +1,24 @@
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def is_duration(spec) -> bool:
+    """Whether spec is a duration with a unit suffix ('90s', '15m', '1h', '2d', '1w')."""
+    spec = str(spec).strip().lower()
+    return len(spec) > 1 and spec[-1] in UNITS
+
+
+def parse_duration(spec) -> float:
+    """Seconds in a duration like '90s', '15m', '1h', '2d' or '1w'; a bare number is seconds."""
+    spec = str(spec).strip().lower()
+    seconds = float(spec[:-1]) * UNITS[spec[-1]] if is_duration(spec) else float(spec)
+    if seconds <= 0:
+        raise ValueError(f"Invalid duration: {spec}")
+    return seconds
+
+
+def format_duration(seconds: float) -> str:
+    """Shortest exact rendering with the largest unit: 3600 -> '1h', 5400 -> '90m'."""
+    for unit, size in sorted(UNITS.items(), key=lambda x: -x[1]):
+        if seconds % size == 0:
+            return f"{int(seconds // size)}{unit}"
+    return f"{seconds:g}s"
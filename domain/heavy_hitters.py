@@ -0,0 +1,239 @@
+from __future__ import annotations
+import hashlib
+import heapq
+import math
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+ValueType = Union[int, float, str]
+
+
+def _stable_hash(value: ValueType) -> Tuple[int, int]:
+    """Two 64-bit hashes of a value, identical across processes (unlike hash() on str)."""
+    # 2 and 2.0 are the same value for dicts and domains, so they must hash alike here too
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    digest = hashlib.blake2b(repr(value).encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class CountMinSketch:
+    """
+    Count-min sketch: a depth × width table of counters, one hashed counter per row and value.
+
+    estimate() never underestimates (as long as removals only undo additions) and, with
+    probability 1 - exp(-depth), overestimates by at most e / width × total.
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total: int = 0
+        # Flat row-major counters: a plain list makes the few scalar updates per value cheap
+        self.table: List[int] = [0] * (depth * width)
+
+    def _cells(self, value: ValueType) -> List[int]:
+        """Flat table index of the value's counter in every row (double hashing: h1 + i·h2)."""
+        h1, h2 = _stable_hash(value)
+        width = self.width
+        return [i * width + (h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, value: ValueType, count: int = 1) -> None:
+        table = self.table
+        for cell in self._cells(value):
+            table[cell] += count
+        self.total += count
+
+    def estimate(self, value: ValueType) -> int:
+        table = self.table
+        return min(table[cell] for cell in self._cells(value))
+
+    @property
+    def error_bound(self) -> int:
+        """Overestimation bound of estimate(), holding with probability 1 - exp(-depth)."""
+        return math.ceil(math.e / self.width * self.total)
+
+    def merge(self, other: CountMinSketch) -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("count-min sketches of different shapes cannot be merged")
+        self.table = [a + b for a, b in zip(self.table, other.table)]
+        self.total += other.total
+
+    def to_dict(self) -> dict:
+        return {"width": self.width, "depth": self.depth, "total": self.total, "table": self.table}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CountMinSketch:
+        sketch = cls(data["width"], data["depth"])
+        sketch.total = data["total"]
+        sketch.table = list(data["table"])
+        return sketch
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-k summary: at most `capacity` monitored values with counts.
+
+    When a new value arrives and the summary is full, it replaces the least counted value and
+    inherits its count, recorded as the new entry's error. Every value occurring more than
+    total / capacity times is monitored, and count - error <= true count <= count.
+    """
+
+    def __init__(self, capacity: int = 256):
+        self.capacity = capacity
+        self.total: int = 0
+        self.counts: Dict[ValueType, int] = {}
+        self.errors: Dict[ValueType, int] = {}
+        # Min-heap of (count, tiebreak, value) with lazy deletion of outdated entries
+        self._heap: List[Tuple[int, int, ValueType]] = []
+        self._pushes: int = 0
+
+    def _push(self, value: ValueType) -> None:
+        self._pushes += 1
+        heapq.heappush(self._heap, (self.counts[value], self._pushes, value))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(count, i, value) for i, (value, count) in enumerate(self.counts.items())]
+        heapq.heapify(self._heap)
+        self._pushes = len(self._heap)
+
+    def _pop_min(self) -> ValueType:
+        while True:
+            count, _, value = heapq.heappop(self._heap)
+            if self.counts.get(value) == count:
+                return value
+
+    def add(self, value: ValueType, count: int = 1) -> None:
+        self.total += count
+        if value in self.counts:
+            self.counts[value] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[value] = count
+            self.errors[value] = 0
+        else:
+            evicted = self._pop_min()
+            floor = self.counts.pop(evicted)
+            del self.errors[evicted]
+            self.counts[value] = floor + count
+            self.errors[value] = floor
+        self._push(value)
+
+    def remove(self, value: ValueType) -> None:
+        """Undo one occurrence; a value no longer monitored only lowers the total."""
+        self.total -= 1
+        if value not in self.counts:
+            return
+        self.counts[value] -= 1
+        self.errors[value] = min(self.errors[value], self.counts[value])
+        if self.counts[value] <= 0:
+            del self.counts[value]
+            del self.errors[value]
+        else:
+            self._push(value)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[ValueType, int, int]]:
+        """(value, count, error) by decreasing count; ties keep the order values were first monitored."""
+        ranked = sorted(self.counts.items(), key=lambda x: -x[1])[:n]
+        return [(value, count, self.errors[value]) for value, count in ranked]
+
+    def merge(self, other: SpaceSaving) -> None:
+        """Combine two summaries (Agarwal et al.): unmonitored values count as each side's minimum."""
+        floor_self = min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+        floor_other = min(other.counts.values()) if len(other.counts) >= other.capacity else 0
+        counts: Dict[ValueType, int] = {}
+        errors: Dict[ValueType, int] = {}
+        for value in list(self.counts) + [v for v in other.counts if v not in self.counts]:
+            counts[value] = self.counts.get(value, floor_self) + other.counts.get(value, floor_other)
+            errors[value] = self.errors.get(value, floor_self) + other.errors.get(value, floor_other)
+        kept = sorted(counts, key=lambda v: -counts[v])[:self.capacity]
+        self.counts = {v: counts[v] for v in kept}
+        self.errors = {v: errors[v] for v in kept}
+        self.total += other.total
+        self._rebuild_heap()
+
+    def to_dict(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "entries": [[value, count, self.errors[value]] for value, count in self.counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> SpaceSaving:
+        summary = cls(data["capacity"])
+        summary.total = data["total"]
+        for value, count, error in data["entries"]:
+            summary.counts[value] = count
+            summary.errors[value] = error
+        summary._rebuild_heap()
+        return summary
+
+
+class HeavyHitters:
+    """
+    Fixed-memory frequency summary of a high-cardinality variable: Space-Saving for the top
+    values and a count-min sketch for point estimates of any value. Reported counts carry the
+    tighter of the two overestimation bounds.
+    """
+
+    def __init__(self, capacity: int = 256, width: int = 2048, depth: int = 4):
+        self.top_k = SpaceSaving(capacity)
+        self.sketch = CountMinSketch(width, depth)
+
+    @classmethod
+    def from_frequencies(cls, frequencies: Dict[ValueType, int], **kwargs) -> HeavyHitters:
+        hh = cls(**kwargs)
+        # Largest counts first, so that the exact heaviest values are the ones monitored
+        for value, count in sorted(frequencies.items(), key=lambda x: -x[1]):
+            hh.add(value, count)
+        return hh
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def add(self, value: ValueType, count: int = 1) -> None:
+        self.top_k.add(value, count)
+        self.sketch.add(value, count)
+
+    def remove(self, value: ValueType) -> None:
+        self.top_k.remove(value)
+        self.sketch.add(value, -1)
+
+    def estimate(self, value: ValueType) -> Tuple[int, int]:
+        """(estimated count, maximum overestimation) of any value."""
+        if value in self.top_k.counts:
+            return self._bounded(value)
+        return self.sketch.estimate(value), self.sketch.error_bound
+
+    def _bounded(self, value: ValueType) -> Tuple[int, int]:
+        # Both structures only overestimate: report the smaller count, against Space-Saving's lower bound
+        count, error = self.top_k.counts[value], self.top_k.errors[value]
+        upper = min(count, self.sketch.estimate(value))
+        return upper, upper - (count - error)
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[ValueType, int, int]]:
+        """(value, estimated count, maximum overestimation) of the n heaviest values."""
+        return [(value, *self._bounded(value)) for value, _, _ in self.top_k.top(n)]
+
+    def mode(self) -> Optional[ValueType]:
+        top = self.top_k.top(1)
+        return top[0][0] if top else None
+
+    def __iter__(self) -> Iterator[ValueType]:
+        return iter(self.top_k.counts)
+
+    def merge(self, other: HeavyHitters) -> None:
+        self.top_k.merge(other.top_k)
+        self.sketch.merge(other.sketch)
+
+    def to_dict(self) -> dict:
+        return {"top_k": self.top_k.to_dict(), "sketch": self.sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> HeavyHitters:
+        hh = cls.__new__(cls)
+        hh.top_k = SpaceSaving.from_dict(data["top_k"])
+        hh.sketch = CountMinSketch.from_dict(data["sketch"])
+        return hh
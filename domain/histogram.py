@@ -0,0 +1,87 @@
+from __future__ import annotations
+import math
+from typing import List, Optional, Tuple
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class Histogram:
+    """
+    Vectorized binning of a variable's values for distribution plots.
+
+    Numeric strategies:
+      - "fixed": bins of width 10^-resolution aligned on multiples of the width (a value v falls
+        in floor(v·10^r)/10^r); only non-empty bins are returned, so fine resolutions over wide
+        ranges stay cheap. When that gives more than max_bins bins (a continuous variable, say),
+        the width grows by powers of 10 until it does not.
+      - "fd": Freedman–Diaconis width 2·IQR·n^(-1/3) (Sturges when the IQR is 0).
+      - "sturges": ceil(log2 n) + 1 equal-width bins.
+      - "quantile": as many bins as Sturges, with edges at equally spaced quantiles, so that bins
+        hold about the same number of values.
+    Every numeric strategy returns at most max_bins bins. Categorical values are counted per
+    distinct value.
+    """
+
+    STRATEGIES = ("fixed", "fd", "sturges", "quantile")
+
+    @staticmethod
+    def numeric(values: np.ndarray, strategy: str = "fixed", resolution: Optional[int] = 2,
+                max_bins: int = 500) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(left edges, widths, counts) of the bins of a numeric array."""
+        if strategy not in Histogram.STRATEGIES:
+            raise ValueError(f"Unknown bin strategy: {strategy} (expected one of {', '.join(Histogram.STRATEGIES)})")
+        if not len(values):
+            return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+
+        if strategy == "fixed":
+            if resolution is None:
+                keys, counts = np.unique(values, return_counts=True)
+                if len(keys) <= max_bins:
+                    return keys, np.full(len(keys), Histogram._min_gap(keys)), counts
+                # Too many distinct values: the smallest power-of-10 width spanning the range in max_bins bins
+                span = float(keys[-1] - keys[0])
+                resolution = -math.ceil(math.log10(span / max_bins))
+            while True:
+                factor = 10 ** resolution
+                bins, counts = np.unique(np.floor(values * factor), return_counts=True)
+                if len(bins) <= max_bins:
+                    return bins / factor, np.full(len(bins), 1 / factor), counts
+                resolution -= 1
+
+        data = values.astype(np.float64)
+        n = len(data)
+        sturges = int(math.ceil(math.log2(n))) + 1
+        if strategy == "quantile":
+            edges = np.unique(np.quantile(data, np.linspace(0, 1, sturges + 1)))
+            if len(edges) < 2:
+                edges = np.array([edges[0] - 0.5, edges[0] + 0.5])
+        else:
+            count = sturges
+            if strategy == "fd":
+                q1, q3 = np.percentile(data, [25, 75])
+                width = 2 * (q3 - q1) * n ** (-1 / 3)
+                if width > 0:
+                    count = int(math.ceil((data.max() - data.min()) / width))
+            edges = np.histogram_bin_edges(data, bins=max(1, min(count, max_bins)))
+        counts, edges = np.histogram(data, bins=edges)
+        return edges[:-1], np.diff(edges), counts
+
+    @staticmethod
+    def _min_gap(keys: np.ndarray) -> float:
+        """Bar width for exact values: the smallest distance between neighbours (1 if single)."""
+        gaps = np.diff(keys.astype(np.float64))
+        return float(gaps.min()) if len(gaps) else 1.0
+
+    @staticmethod
+    def categorical(codes: np.ndarray, uniques: List) -> Tuple[List, List[int]]:
+        """
+        (categories, counts) from factorized values, sorted by category when the categories are
+        comparable, else by decreasing count.
+        """
+        counts = np.bincount(codes, minlength=len(uniques)).tolist()
+        try:
+            order = sorted(range(len(uniques)), key=lambda i: uniques[i])
+        except TypeError:
+            order = sorted(range(len(uniques)), key=lambda i: (-counts[i], str(uniques[i])))
+        return [uniques[i] for i in order], [counts[i] for i in order]
@@ -0,0 +1,24 @@
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    A module that is only executed on first attribute access, so that importing a module
+    which uses it does not pay for loading it (numpy alone is ~80 ms of CLI startup).
+
+    Modules using it at definition time (e.g. `np.ndarray` in signatures) need
+    `from __future__ import annotations`. An already imported module is returned as is.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
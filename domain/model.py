@@ -1,34 +1,96 @@
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional
+from domain.accumulator import StatsAccumulator
 from domain.event import Event
 from domain.object import Object
+from domain.property import Property
 from domain.variable import Variable
 
 
 class Model:
-    def __init__(self, events: List[Event]):
-        self.objects: List[Object] = self._abstract_objects(events)
+    def __init__(self, events: List[Event], snapshot: Optional[dict] = None):
+        self._objects_map: Dict[str, Object] = {}
+        self._last_states: Dict[str, List[Property]] = {}
+        self.objects: List[Object] = []
+        self.event_count: int = 0
+        self.last_timestamp: Optional[datetime] = None
+
+        # Events covered by a valid snapshot only fill the series; their statistics come from the snapshot
+        covered = self._snapshot_coverage(events, snapshot)
+        for event in events[:covered]:
+            self.ingest(event, accumulate=False)
+        if covered:
+            self._restore_accumulators(snapshot)
+        for event in events[covered:]:
+            self.ingest(event)
 
     @staticmethod
-    def _abstract_objects(events: List[Event]) -> List[Object]:
-        objects_map: Dict[str, Object] = {}
+    def _snapshot_coverage(events: List[Event], snapshot: Optional[dict]) -> int:
+        """Number of leading events the snapshot was taken after, or 0 if it does not match them."""
+        if not snapshot:
+            return 0
+        covered = snapshot.get("event_count", 0)
+        if not 0 < covered <= len(events):
+            return 0
+        if events[covered - 1].timestamp.isoformat() != snapshot.get("last_timestamp"):
+            return 0
+        return covered
+
+    def _restore_accumulators(self, snapshot: dict) -> None:
+        for obj_name, variables in snapshot.get("objects", {}).items():
+            obj = self._objects_map.get(obj_name)
+            if obj is None:
+                continue
+            for var_name, data in variables.items():
+                variable = obj.variables.get(var_name)
+                if variable is not None:
+                    variable.data.accumulator = StatsAccumulator.from_dict(data["accumulator"])
+
+    def snapshot(self) -> dict:
+        """Persistable summary of the model: per-variable accumulators and the events they cover."""
+        return {
+            "event_count": self.event_count,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None,
+            "objects": {
+                obj.name: {
+                    var_name: {"accumulator": variable.data.accumulator.to_dict()}
+                    for var_name, variable in obj.variables.items()
+                }
+                for obj in self.objects
+            },
+        }
 
-        for event in events:
-            for record in event.records:
-                # ensure observable object exists
-                if record.observable not in objects_map:
-                    objects_map[record.observable] = Object(name=record.observable)
+    def ingest(self, event: Event, accumulate: bool = True) -> None:
+        """Add a single event to the model, creating objects and variables as needed."""
+        self.event_count += 1
+        self.last_timestamp = event.timestamp
+        for record in event.records:
+            # ensure observable object exists
+            obj = self._objects_map.get(record.observable)
+            if obj is None:
+                obj = Object(name=record.observable)
+                self._objects_map[record.observable] = obj
+                self.objects.append(obj)
 
-                obj = objects_map[record.observable]
+            # a deduplicated record repeats the observable's previous state at this timestamp
+            if record.unchanged:
+                state = self._last_states.get(record.observable, [])
+            else:
+                state = record.state
+                if state:
+                    self._last_states[record.observable] = state
 
-                # for each property in the record, add/update variable
-                for prop in record.state:
-                    if prop.name not in obj.variables:
-                        obj.variables[prop.name] = Variable(name=prop.name)
+            # for each property in the record, add/update variable
+            for prop in state:
+                if prop.name not in obj.variables:
+                    obj.variables[prop.name] = Variable(name=prop.name)
 
-                    # store value in variable’s time series at record timestamp
-                    obj.variables[prop.name].data[event.timestamp] = prop.value
+                # store value in variable’s time series at record timestamp
+                obj.variables[prop.name].data.add(event.timestamp, prop.value, accumulate)
 
-        return list(objects_map.values())
+    def last_state(self, observable_name: str) -> Optional[List[Property]]:
+        """The most recent full state ingested for an observable, if any."""
+        return self._last_states.get(observable_name)
 
     def __str__(self) -> str:
         lines = []
@@ -42,4 +104,4 @@ class Model:
                 if len(var.data) > 5:
                     values_preview += ", ..."
                 lines.append(f"  Variable: {var_name} -> {values_preview}")
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
@@ -1,20 +1,42 @@
 from __future__ import annotations
 from pathlib import Path
 from urllib.parse import urlparse
-from typing import List
+from typing import List, Optional, Tuple
+import hashlib
 import json
-import requests
+import os
 
+from domain.lazy import lazy_import
 from domain.property import Property
 from infrastructure.processing.external_script_handler import ExternalScriptHandler
+from infrastructure.processing.json_codec import JsonCodec
+from infrastructure.processing.json_flattener import JsonFlattener, PathFilter
+
+# Only URL sources need the HTTP stack
+requests = lazy_import("requests")
 
 
 class Observable:
-    def __init__(self, name: str, source: str):
+    def __init__(
+            self,
+            name: str,
+            source: str,
+            interval: Optional[float] = None,
+            include: Optional[List[str]] = None,
+            exclude: Optional[List[str]] = None,
+    ):
         self.name: str = name
         self.source: str = source
+        self.interval: Optional[float] = interval  # sampling period in seconds, used by the collector daemon
+        # Path patterns selecting which parts of the fetched document become variables
+        self.include: List[str] = list(include or [])
+        self.exclude: List[str] = list(exclude or [])
+        self.path_filter: PathFilter = PathFilter(self.include, self.exclude)
         self.is_url: bool = False
         self.is_local: bool = False
+        # Last seen (mtime, size, content hash) of a local JSON source, and the state flattened from it
+        self._file_signature: Optional[Tuple[int, int, str]] = None
+        self._cached_state: Optional[List[Property]] = None
         self._validate_source()
 
     def _validate_source(self):
@@ -25,32 +47,58 @@ class Observable:
         else:
             self.is_local = Path(self.source).exists()
 
-    def fetch_state(self) -> List["Property"]:
-        def flatten(data, parent_key=""):
-            items = []
-            if isinstance(data, dict):
-                for k, v in data.items():
-                    new_key = f"{parent_key}/{k}" if parent_key else k
-                    items.extend(flatten(v, new_key))
-            elif isinstance(data, list):
-                for idx, v in enumerate(data):
-                    new_key = f"{parent_key}/{idx}" if parent_key else str(idx)
-                    items.extend(flatten(v, new_key))
-            else:
-                if isinstance(data, (str, int, float)):
-                    items.append((parent_key, data))
-            return items
+    @property
+    def is_json_file(self) -> bool:
+        return self.is_local and Path(self.source).suffix.lower() == ".json"
+
+    def _fetch_json_file(self, path: Path) -> List[Property]:
+        """
+        Read a local JSON source, reusing the previous state when the file is unchanged:
+        first by (mtime, size), then, if those moved, by a hash of the content.
+        """
+        st = os.stat(path)
+        if self._cached_state is not None and (st.st_mtime_ns, st.st_size) == self._file_signature[:2]:
+            return list(self._cached_state)
+
+        with open(path, "rb") as f:
+            content = f.read()
+        digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+        if self._cached_state is not None and digest == self._file_signature[2]:
+            self._file_signature = (st.st_mtime_ns, st.st_size, digest)
+            return list(self._cached_state)
+
+        state = self._to_properties(JsonCodec.loads(content))
+        self._file_signature = (st.st_mtime_ns, st.st_size, digest)
+        self._cached_state = state
+        return list(state)
 
+    def _to_properties(self, raw_data) -> List[Property]:
+        props = []
+        if isinstance(raw_data, (dict, list)):
+            for k, v in JsonFlattener.flatten(raw_data, self.path_filter):
+                props.append(Property(name=k, value=v))
+        elif isinstance(raw_data, list):
+            for item in raw_data:
+                if isinstance(item, dict) and "name" in item and "value" in item:
+                    props.append(Property(name=item["name"], value=item["value"]))
+        return props
+
+    def fetch_state(self, strict: bool = False) -> List["Property"]:
+        """
+        Fetch and flatten the current state of the source.
+
+        With strict=False failures are reported and an empty state is returned;
+        with strict=True the exception is propagated so callers can react (e.g. back off).
+        """
         try:
             if self.is_url:
                 response = requests.get(self.source, timeout=5)
                 response.raise_for_status()
-                raw_data = response.json()
+                raw_data = JsonCodec.loads(response.content)
             elif self.is_local:
                 path = Path(self.source)
                 if path.suffix.lower() == ".json":
-                    with open(path, "r", encoding="utf-8") as f:
-                        raw_data = json.load(f)
+                    return self._fetch_json_file(path)
                 else:
                     # Treat as script
                     class DummyScript:
@@ -61,30 +109,40 @@ class Observable:
 
                     script = DummyScript(path)
                     output = ExternalScriptHandler.run_script_and_capture(script)
-                    raw_data = json.loads(output)
+                    raw_data = JsonCodec.loads(output)
             else:
                 raise ValueError(f"Invalid source path or URL: {self.source}")
 
-            props = []
-            if isinstance(raw_data, (dict, list)):
-                for k, v in flatten(raw_data):
-                    props.append(Property(name=k, value=v))
-            elif isinstance(raw_data, list):
-                for item in raw_data:
-                    if isinstance(item, dict) and "name" in item and "value" in item:
-                        props.append(Property(name=item["name"], value=item["value"]))
-
-            return props
+            return self._to_properties(raw_data)
 
         except Exception as e:
+            if strict:
+                raise
             print(f"Failed to fetch or parse state for {self.name}: {e}")
             return []
 
     def to_dict(self) -> dict:
-        return {
+        data = {
             "name": self.name,
             "source": self.source,
         }
+        if self.interval is not None:
+            data["interval"] = self.interval
+        if self.include:
+            data["include"] = self.include
+        if self.exclude:
+            data["exclude"] = self.exclude
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Observable:
+        return cls(
+            name=data["name"],
+            source=data["source"],
+            interval=data.get("interval"),
+            include=data.get("include"),
+            exclude=data.get("exclude"),
+        )
 
     def __repr__(self) -> str:
         return f"Observable(name={self.name!r}, source={self.source!r})"
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from domain.stats import Stats
 
@@ -23,6 +23,12 @@ class PlotData:
     # Stats object
     stats: Optional["Stats"] = None
 
+    # Additional y series aligned with x (e.g. rolling std/min/max), by name
+    series: Optional[Dict[str, List]] = None
+
+    # Bar widths of a histogram, x holding the left edges of the bins
+    widths: Optional[List[float]] = None
+
     def __str__(self) -> str:
         def sample(lst, n=5):
             """Return a preview of list values with ellipsis if too long."""
@@ -46,6 +52,8 @@ class PlotData:
             f"  Y label     : {self.y_label}",
             f"    sample    : {sample(self.y)}",
         ])
+        for name, values in (self.series or {}).items():
+            lines.append(f"  Series {name:<5}: {sample(values)}")
         if self.stats:
             lines.append("  Stats       :")
             for field, value in self.stats.__dict__.items():
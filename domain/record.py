@@ -2,13 +2,26 @@ from __future__ import annotations
 from domain.property import Property
 from dataclasses import dataclass
 from typing import List
+import hashlib
+
+from infrastructure.processing.json_codec import JsonCodec
 
 @dataclass
 class Record:
     observable: str
     state: List["Property"]
+    # True when the observable's state was identical to its previous record; the state is then
+    # not stored and readers carry the previous state forward to this record's timestamp.
+    unchanged: bool = False
+
+    def state_digest(self) -> str:
+        """Content hash of the state, sensitive to names, values, value types and order."""
+        payload = JsonCodec.dumpb([[prop.name, prop.value] for prop in self.state])
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
     def to_dict(self) -> dict:
+        if self.unchanged:
+            return {"observable": self.observable, "unchanged": True}
         return {
             "observable": self.observable,
             "state": [prop.to_dict() for prop in self.state],
@@ -16,8 +29,9 @@ class Record:
 
     @classmethod
     def from_dict(cls, data: dict) -> "Record":
+        if data.get("unchanged", False):
+            return cls(observable=data["observable"], state=[], unchanged=True)
         return cls(
             observable=data["observable"],
             state=[Property.from_dict(p) for p in data["state"]],
         )
-
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Extrapolation methods backed by a least-squares polynomial, with their degree
+FIT_METHODS = {"linear": 1, "quadratic": 2}
+
+
+@dataclass
+class PolynomialFit:
+    """
+    Least-squares polynomial in centered and scaled time: y = Σ coeffs[k]·u^k with
+    u = (t - center) / unit, t in epoch seconds. Evaluating in u rather than in raw epoch
+    seconds avoids the cancellation a quadratic in ~1e9-second timestamps suffers from.
+    """
+    center: float
+    unit: float
+    coeffs: np.ndarray
+    count: int = 0
+
+    def __call__(self, timestamps) -> np.ndarray:
+        return np.polynomial.polynomial.polyval((np.asarray(timestamps, dtype=np.float64) - self.center) / self.unit, self.coeffs)
+
+    @classmethod
+    def fit(cls, timestamps: np.ndarray, values: np.ndarray, degree: int) -> Optional[PolynomialFit]:
+        """Direct fit over arrays (e.g. a time window of the series)."""
+        if not len(timestamps):
+            return None
+        center = float(timestamps.mean())
+        unit = float(np.abs(timestamps - center).max()) or 1.0
+        u = (timestamps - center) / unit
+        vander = np.vander(u, degree + 1, increasing=True)
+        coeffs, *_ = np.linalg.lstsq(vander, values.astype(np.float64), rcond=None)
+        return cls(center, unit, coeffs, len(timestamps))
+
+    @classmethod
+    def fit_shared(cls, timestamps: np.ndarray, values: np.ndarray, degree: int) -> List[PolynomialFit]:
+        """
+        Fits of several series sampled at the same times (values has one column per series),
+        from a single least-squares solve with one right-hand side per series.
+        """
+        center = float(timestamps.mean())
+        unit = float(np.abs(timestamps - center).max()) or 1.0
+        vander = np.vander((timestamps - center) / unit, degree + 1, increasing=True)
+        coeffs, *_ = np.linalg.lstsq(vander, values.astype(np.float64), rcond=None)
+        return [cls(center, unit, coeffs[:, j], len(timestamps)) for j in range(values.shape[1])]
+
+    @staticmethod
+    def evaluate_many(fits: List[PolynomialFit], timestamps: np.ndarray) -> np.ndarray:
+        """Values of every fit at every time, as a (len(timestamps), len(fits)) array."""
+        size = max((len(fit.coeffs) for fit in fits), default=0)
+        coeffs = np.zeros((size, len(fits)))
+        for j, fit in enumerate(fits):
+            coeffs[:len(fit.coeffs), j] = fit.coeffs
+        centers = np.array([fit.center for fit in fits])
+        units = np.array([fit.unit for fit in fits])
+        u = (np.asarray(timestamps, dtype=np.float64)[:, None] - centers) / units
+        # Horner's scheme over all series at once
+        result = np.zeros(u.shape)
+        for k in range(size - 1, -1, -1):
+            result = result * u + coeffs[k]
+        return result
+
+
+class RegressionAccumulator:
+    """
+    Sufficient statistics of least-squares polynomial fits (up to MAX_DEGREE) of a variable's
+    numeric values against time, updated in O(1) per sample.
+
+    Keeps the running means of the time (in `scale` seconds) and of the values, and the co-moments
+    Σ d^j·e^k about them (d, e the deviations from the means; d^j for j ≤ 2·MAX_DEGREE, d^j·e for
+    j ≤ MAX_DEGREE). Like the Welford mean/M2 of StatsAccumulator, every update re-centers the
+    co-moments on the new means by the (small) shift of the means, so they stay of the size of
+    the true spread however large the timestamps, and a fit never subtracts large raw powers.
+    """
+
+    MAX_DEGREE = 2
+
+    def __init__(self, scale: float = 86400.0):
+        self.scale = scale
+        self.count: int = 0
+        self.mean_time: float = 0.0
+        self.mean_value: float = 0.0
+        # time_moments[j] = Σ d^j and value_moments[j] = Σ d^j·e; Σ d and Σ e (index 1 and 0) stay 0
+        self.time_moments: List[float] = [0.0] * (2 * self.MAX_DEGREE + 1)
+        self.value_moments: List[float] = [0.0] * (self.MAX_DEGREE + 1)
+
+    def _update(self, timestamp: float, value: float, sign: int) -> None:
+        t = timestamp / self.scale
+        n = self.count
+        count = n + sign
+        if count <= 0:
+            self.__init__(self.scale)
+            return
+        # Shift of the means; the co-moments are re-expressed about the new means as
+        # Σ (d - a)^j·(e - b)^k, simplified with Σ d = Σ e = 0 (written out for MAX_DEGREE = 2)
+        a = sign * (t - self.mean_time) / count
+        b = sign * (value - self.mean_value) / count
+        _, _, m2, m3, m4 = self.time_moments
+        _, c1, c2 = self.value_moments
+        self.time_moments[2] = m2 + a * a * n
+        self.time_moments[3] = m3 - 3 * a * m2 - a ** 3 * n
+        self.time_moments[4] = m4 - 4 * a * m3 + 6 * a * a * m2 + a ** 4 * n
+        self.value_moments[1] = c1 + a * b * n
+        self.value_moments[2] = c2 - 2 * a * c1 - b * (m2 + a * a * n)
+        self.count = count
+        self.mean_time += a
+        self.mean_value += b
+
+        # Add or take out the sample's own term, about the new means
+        d, e = t - self.mean_time, value - self.mean_value
+        d2 = d * d
+        self.time_moments[2] += sign * d2
+        self.time_moments[3] += sign * d2 * d
+        self.time_moments[4] += sign * d2 * d2
+        self.value_moments[1] += sign * d * e
+        self.value_moments[2] += sign * d2 * e
+        self.time_moments[0] = float(count)
+
+    def add(self, timestamp: float, value: float) -> None:
+        self._update(timestamp, value, 1)
+
+    def remove(self, timestamp: float, value: float) -> None:
+        self._update(timestamp, value, -1)
+
+    def fit(self, degree: int) -> Optional[PolynomialFit]:
+        """The least-squares polynomial of the given degree (≤ MAX_DEGREE), or None without data."""
+        if degree > self.MAX_DEGREE:
+            raise ValueError(f"Degree {degree} exceeds the accumulated statistics (max {self.MAX_DEGREE})")
+        if self.count <= 0:
+            return None
+        n = self.count
+        spread = (max(self.time_moments[2], 0.0) / n) ** 0.5 or 1.0
+
+        # Normal equations in u = d / spread, for the values' deviations from their mean
+        size = degree + 1
+        normal = np.array([[self.time_moments[i + j] / spread ** (i + j) for j in range(size)] for i in range(size)])
+        rhs = np.array([self.value_moments[i] / spread ** i for i in range(size)])
+        coeffs, *_ = np.linalg.lstsq(normal, rhs, rcond=None)
+        coeffs[0] += self.mean_value
+        return PolynomialFit(
+            center=self.mean_time * self.scale,
+            unit=spread * self.scale,
+            coeffs=coeffs,
+            count=n,
+        )
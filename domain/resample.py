@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import Tuple
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class Resampler:
+    """
+    Fixed-interval bucketing of a time-sorted series, vectorized over the column arrays.
+
+    Buckets are aligned on multiples of the interval since the epoch (hourly buckets start on
+    the hour, UTC), and only non-empty buckets are returned. Samples are grouped by locating
+    bucket boundaries in the sorted bucket numbers; numeric aggregations then reduce each
+    contiguous group with ufunc.reduceat, and the mode counts (bucket, value code) pairs.
+    """
+
+    NUMERIC_AGGREGATIONS = ("mean", "min", "max", "last", "count", "sum")
+    AGGREGATIONS = NUMERIC_AGGREGATIONS + ("mode",)
+
+    @staticmethod
+    def buckets(timestamps: np.ndarray, interval: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Start time of every non-empty bucket, index of its first sample, and bucket id of every sample."""
+        numbers = np.floor(timestamps / interval).astype(np.int64)
+        if not len(numbers):
+            return np.empty(0), np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        change = np.diff(numbers) != 0
+        starts = np.concatenate(([0], np.flatnonzero(change) + 1))
+        group = np.concatenate(([0], np.cumsum(change)))
+        return numbers[starts] * interval, starts, group
+
+    @staticmethod
+    def resample(timestamps: np.ndarray, values: np.ndarray, interval: float, how: str = "mean") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (bucket start times, aggregated values). Numeric aggregations expect an int64/float64
+        array; "mode" works on any values, ties going to the value seen first.
+        """
+        if how not in Resampler.AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation: {how} (expected one of {', '.join(Resampler.AGGREGATIONS)})")
+        bucket_starts, starts, group = Resampler.buckets(timestamps, interval)
+        if not len(starts):
+            return bucket_starts, values[:0]
+
+        if how == "mode":
+            return bucket_starts, Resampler._mode(values, group)
+
+        ends = np.append(starts[1:], len(values))
+        if how == "count":
+            aggregated = ends - starts
+        elif how == "last":
+            aggregated = values[ends - 1]
+        elif how == "min":
+            aggregated = np.minimum.reduceat(values, starts)
+        elif how == "max":
+            aggregated = np.maximum.reduceat(values, starts)
+        elif how == "sum":
+            aggregated = np.add.reduceat(values, starts)
+        else:
+            aggregated = np.add.reduceat(values.astype(np.float64), starts) / (ends - starts)
+        return bucket_starts, aggregated
+
+    @staticmethod
+    def _mode(values: np.ndarray, group: np.ndarray) -> np.ndarray:
+        # Factorize values with codes in order of first appearance
+        if values.dtype != object:
+            _, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+            rank = np.empty(len(first), dtype=np.int64)
+            rank[np.argsort(first, kind="stable")] = np.arange(len(first))
+            codes = rank[inverse.ravel()]
+        else:
+            index = {}
+            codes = np.fromiter((index.setdefault(v, len(index)) for v in values), dtype=np.int64, count=len(values))
+        distinct = int(codes.max()) + 1
+
+        # Count every (bucket, code) pair, then keep the most frequent pair of each bucket
+        pairs, counts = np.unique(group.astype(np.int64) * distinct + codes, return_counts=True)
+        pair_bucket = pairs // distinct
+        order = np.lexsort((pairs % distinct, -counts, pair_bucket))
+        winners = order[np.flatnonzero(np.diff(pair_bucket[order], prepend=-1))]
+
+        # Read the winning value back from its first occurrence
+        _, first_position = np.unique(codes, return_index=True)
+        return values[first_position[pairs[winners] % distinct]]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict
+from domain.lazy import lazy_import
+
+from domain.duration import format_duration, is_duration, parse_duration
+
+np = lazy_import("numpy")
+
+
+@dataclass(frozen=True)
+class RollingWindow:
+    """A trailing window of the last `size` samples, or (by_time) of the last `size` seconds."""
+    size: float
+    by_time: bool = False
+
+    @classmethod
+    def parse(cls, spec) -> "RollingWindow":
+        """'20' is a window of 20 samples; '90s', '15m', '1h', '2d' or '1w' a time window."""
+        if is_duration(spec):
+            return cls(parse_duration(spec), by_time=True)
+        samples = int(spec)
+        if samples < 1:
+            raise ValueError(f"Invalid rolling window: {spec}")
+        return cls(samples)
+
+    def starts(self, timestamps: np.ndarray) -> np.ndarray:
+        """Index of the first sample of the window ending at each sample (inclusive)."""
+        n = len(timestamps)
+        if self.by_time:
+            # Window (t - size, t]
+            return np.searchsorted(timestamps, timestamps - self.size, side="right")
+        return np.maximum(np.arange(n) - int(self.size) + 1, 0)
+
+    def __str__(self) -> str:
+        if not self.by_time:
+            return f"{int(self.size)} samples"
+        return format_duration(self.size)
+
+
+class RollingStats:
+    """
+    Moving count, mean, std (sample), min and max of a time-sorted numeric series, in O(n).
+
+    Mean and std come from shifted cumulative sums of the values and their squares; min and max
+    from monotonic deques of candidate indices, so every sample is pushed and popped once
+    whatever the window length.
+    """
+
+    @staticmethod
+    def compute(timestamps: np.ndarray, values: np.ndarray, window: RollingWindow) -> Dict[str, np.ndarray]:
+        n = len(values)
+        starts = window.starts(timestamps)
+        ends = np.arange(1, n + 1)
+        count = ends - starts
+
+        shift = float(values[0]) if n else 0.0
+        centered = values.astype(np.float64) - shift
+        sums = np.concatenate(([0.0], np.cumsum(centered)))
+        squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        total = sums[ends] - sums[starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = (squares[ends] - squares[starts] - total * total / count) / (count - 1)
+        std = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), 0.0)
+
+        return {
+            "count": count,
+            "mean": shift + total / np.maximum(count, 1),
+            "std": std,
+            "min": RollingStats._extreme(values, starts, lowest=True),
+            "max": RollingStats._extreme(values, starts, lowest=False),
+        }
+
+    @staticmethod
+    def _extreme(values: np.ndarray, starts: np.ndarray, lowest: bool) -> np.ndarray:
+        """Sliding min (or max) for windows [starts[i], i], with starts non-decreasing."""
+        items = values.tolist()
+        result = [0] * len(items)
+        candidates: deque = deque()
+        for i, (value, start) in enumerate(zip(items, starts.tolist())):
+            # Drop candidates the new value dominates, then those that fell out of the window
+            if lowest:
+                while candidates and items[candidates[-1]] >= value:
+                    candidates.pop()
+            else:
+                while candidates and items[candidates[-1]] <= value:
+                    candidates.pop()
+            candidates.append(i)
+            while candidates[0] < start:
+                candidates.popleft()
+            result[i] = items[candidates[0]]
+        return np.array(result, dtype=values.dtype)
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import datetime
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+from domain.lazy import lazy_import
+
+from domain.bootstrap import PredictionBands
+
+np = lazy_import("numpy")
+
+
+@dataclass
+class TimeSeries:
+    """
+    A computed series as aligned column arrays: x holds sorted epoch-second timestamps
+    (float64), y the values. keys()/values()/items() mirror VariableData, so a TimeSeries can
+    be plotted like stored data; datetimes are only materialized on request.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    tzinfo: Optional[datetime.tzinfo] = datetime.timezone.utc
+    # Prediction bands aligned with x, when requested from a forecast
+    bands: Optional[PredictionBands] = None
+
+    def datetimes(self) -> List[datetime.datetime]:
+        tz = self.tzinfo or datetime.timezone.utc
+        return [datetime.datetime.fromtimestamp(t, tz) for t in self.x.tolist()]
+
+    def keys(self) -> List[datetime.datetime]:
+        return self.datetimes()
+
+    def values(self) -> np.ndarray:
+        return self.y
+
+    def items(self) -> Iterator[Tuple[datetime.datetime, float]]:
+        return zip(self.datetimes(), self.y.tolist())
+
+    def __len__(self) -> int:
+        return len(self.x)
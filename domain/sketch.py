@@ -0,0 +1,133 @@
+from __future__ import annotations
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+
+class TDigest:
+    """
+    Mergeable t-digest quantile sketch (merging variant, arcsine scale function).
+
+    Values are buffered and periodically merged into at most ~compression·π/2 centroids, so
+    memory stays bounded whatever the number of values. The rank error is roughly
+    O(1/compression) in the middle of the distribution and much smaller in the tails; the
+    minimum and maximum are exact. Digests of different time segments or shards combine with
+    merge() into the digest of their union.
+    """
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.count: float = 0.0
+        self.min: float = math.inf
+        self.max: float = -math.inf
+        self._means: List[float] = []
+        self._weights: List[float] = []
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_limit = int(compression * 5)
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_limit:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: TDigest) -> None:
+        other._compress()
+        self._buffer.extend(zip(other._means, other._weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self._means, self._weights)) + self._buffer)
+        self._buffer = []
+        total = sum(w for _, w in items)
+
+        means: List[float] = []
+        weights: List[float] = []
+        mean, weight = items[0]
+        q_left = 0.0
+        k_limit = self._k(q_left) + 1
+        for m, w in items[1:]:
+            if self._k((q_left * total + weight + w) / total) <= k_limit:
+                weight += w
+                mean += (m - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                q_left += weight / total
+                k_limit = self._k(q_left) + 1
+                mean, weight = m, w
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    @property
+    def centroids(self) -> int:
+        self._compress()
+        return len(self._means)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value below which a fraction q (0..1) of the values lie."""
+        self._compress()
+        if not self._means:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        means, weights = self._means, self._weights
+        target = q * self.count
+        # Interpolate between centroid centres; the outer halves of the end centroids lean on min/max
+        cumulative = 0.0
+        previous_centre, previous_mean = 0.0, self.min
+        for mean, weight in zip(means, weights):
+            centre = cumulative + weight / 2
+            if target < centre:
+                span = centre - previous_centre
+                fraction = (target - previous_centre) / span if span else 0.0
+                return previous_mean + fraction * (mean - previous_mean)
+            cumulative += weight
+            previous_centre, previous_mean = centre, mean
+
+        span = self.count - previous_centre
+        fraction = (target - previous_centre) / span if span else 0.0
+        return previous_mean + fraction * (self.max - previous_mean)
+
+    def percentiles(self, ps: Sequence[float]) -> dict:
+        return {p: self.quantile(p / 100) for p in ps}
+
+    def to_dict(self) -> dict:
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self._means else None,
+            "max": self.max if self._means else None,
+            "means": self._means,
+            "weights": self._weights,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> TDigest:
+        digest = cls(data["compression"])
+        digest.count = data["count"]
+        digest._means = list(data["means"])
+        digest._weights = list(data["weights"])
+        if digest._means:
+            digest.min, digest.max = data["min"], data["max"]
+        return digest
@@ -0,0 +1,88 @@
+from __future__ import annotations
+import math
+from typing import List, Optional
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class ExponentialSmoother:
+    """
+    Streaming exponential smoothing of an irregularly sampled numeric series.
+
+    Methods:
+      - "simple": a smoothed level; the forecast is flat.
+      - "holt": level and trend (per second); the forecast is a line.
+      - "holt-winters": level, trend and additive seasonal offsets for `slots` equal slots of a
+        `season`-second cycle (by default, hours of the UTC day).
+
+    The state is updated in O(1) per event, in time order. Smoothing weights are per `unit` of
+    time rather than per event: an event dt seconds after the previous one is weighted
+    1 - (1 - alpha)^(dt/unit) (likewise beta, and gamma per season), so dense series average many
+    events and irregular spacing is accounted for. An event older than the last one cannot be
+    folded in and marks the state stale (to be rebuilt from the sorted series). Forecasts
+    evaluate the current state over any time grid in O(horizon).
+    """
+
+    METHODS = ("simple", "holt", "holt-winters")
+
+    def __init__(self, method: str = "simple", alpha: float = 0.3, beta: float = 0.1, gamma: float = 0.1,
+                 unit: float = 86400.0, season: float = 86400.0, slots: int = 24):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown smoothing method: {method} (expected one of {', '.join(self.METHODS)})")
+        self.method = method
+        self.alpha, self.beta, self.gamma = alpha, beta, gamma
+        self.unit, self.season, self.slots = unit, season, slots
+        self.level: float = 0.0
+        self.trend: float = 0.0
+        self.seasonal: List[float] = [0.0] * slots
+        self.count: int = 0
+        self.last: Optional[float] = None
+        self.stale: bool = False
+
+    def _slot(self, timestamp: float) -> int:
+        return int((timestamp % self.season) // (self.season / self.slots))
+
+    def update(self, timestamp: float, value: float) -> None:
+        """Fold in the next event (epoch seconds); an out-of-order event marks the state stale."""
+        seasonal = self.method == "holt-winters"
+        if self.count == 0:
+            self.level = value
+            self.last = timestamp
+            self.count = 1
+            return
+        dt = timestamp - self.last
+        if dt <= 0:
+            self.stale = True
+            return
+
+        self.count += 1
+        alpha = 1 - (1 - self.alpha) ** (dt / self.unit)
+        slot = self._slot(timestamp) if seasonal else 0
+        offset = self.seasonal[slot] if seasonal else 0.0
+
+        level = alpha * (value - offset) + (1 - alpha) * (self.level + self.trend * dt)
+        if self.method != "simple":
+            beta = 1 - (1 - self.beta) ** (dt / self.unit)
+            self.trend = beta * (level - self.level) / dt + (1 - beta) * self.trend
+        if seasonal:
+            # A slot is visited for season/slots seconds per cycle: gamma is per cycle
+            gamma = 1 - (1 - self.gamma) ** min(dt * self.slots / self.season, 1.0)
+            self.seasonal[slot] = gamma * (value - level) + (1 - gamma) * offset
+        self.level = level
+        self.last = timestamp
+
+    def update_many(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        for timestamp, value in zip(timestamps.tolist(), values.tolist()):
+            self.update(timestamp, value)
+
+    def forecast(self, timestamps) -> np.ndarray:
+        """Values the current state predicts at the given epoch seconds (NaN without data)."""
+        times = np.asarray(timestamps, dtype=np.float64)
+        if self.count == 0:
+            return np.full(times.shape, math.nan)
+        result = self.level + self.trend * (times - self.last)
+        if self.method == "holt-winters":
+            slots = ((times % self.season) // (self.season / self.slots)).astype(np.intp)
+            result = result + np.asarray(self.seasonal)[slots]
+        return result
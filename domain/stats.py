@@ -1,12 +1,15 @@
 from domain.domain import RangeDomain, EnumerationDomain, Domain
 from dataclasses import dataclass
-from typing import Dict, Union, List
+from typing import Dict, Union, List, Sequence, Tuple
 import statistics
 
 from domain.variable import Variable
 
 ValueType = Union[int, float, str]
 
+DEFAULT_PERCENTILES = (50, 90, 99)
+DEFAULT_TOP_VALUES = 10
+
 
 @dataclass
 class Stats:
@@ -18,6 +21,11 @@ class Stats:
     max: float = None
     frequencies: Dict[ValueType, int] = None
     mode: ValueType = None
+    percentiles: Dict[float, float] = None
+    # (value, count, error): the true count lies in [count - error, count]
+    top_values: List[Tuple[ValueType, int, int]] = None
+    # True when frequencies, mode and top_values are heavy-hitter estimates rather than exact counts
+    approximate: bool = None
 
 
 class StatsAnalyzer:
@@ -64,3 +72,51 @@ class StatsAnalyzer:
 
         # Fallback for unknown domain types
         return Stats(events=len(values))
+
+    @staticmethod
+    def covers_history(variable: Variable, domain: "Domain") -> bool:
+        """Whether the domain admits every value the variable ever took, so that whole-history stats apply."""
+        acc = variable.data.current_accumulator()
+        if acc.count == 0 or acc.approximate:
+            return False
+        if isinstance(domain, RangeDomain):
+            return acc.all_numeric and domain.min_value <= acc.min and acc.max <= domain.max_value
+        if isinstance(domain, EnumerationDomain):
+            return all(domain.belongs(v) for v in acc.frequencies)
+        return False
+
+    @staticmethod
+    def compute_whole_history(variable: Variable, numeric: bool,
+                              percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                              top: int = DEFAULT_TOP_VALUES) -> Stats:
+        """
+        Stats over every value of the variable, read from its streaming accumulator in O(1)
+        (the median comes from the accumulator's sorted values, percentiles from its t-digest).
+        `numeric` selects the shape returned by compute() for a RangeDomain (True) or an
+        EnumerationDomain (False). Past the accumulator's cardinality threshold, frequencies only
+        hold the estimated counts of the top values, listed with their error bounds in top_values,
+        and approximate is set.
+        """
+        acc = variable.data.current_accumulator()
+        if acc.count == 0:
+            return Stats(events=0)
+        if numeric:
+            return Stats(
+                events=acc.numeric_count,
+                mean=acc.mean,
+                median=acc.median(variable.data.values()),
+                std=acc.std(),
+                min=acc.min,
+                max=acc.max,
+                mode=acc.mode(),
+                percentiles=acc.percentiles(percentiles) if acc.numeric_count else None,
+                approximate=True if acc.approximate else None,
+            )
+        top_values = acc.top(top)
+        return Stats(
+            events=acc.count,
+            frequencies={value: count for value, count, _ in top_values} if acc.approximate else dict(acc.frequencies),
+            mode=acc.mode(),
+            top_values=top_values,
+            approximate=True if acc.approximate else None,
+        )
@@ -1,15 +1,183 @@
+from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Union, Dict, Iterator
+from typing import Union, Dict, Iterator, List, Optional, Tuple
+from domain.lazy import lazy_import
+
+from domain.accumulator import StatsAccumulator
+from domain.regression import RegressionAccumulator
+from domain.smoothing import ExponentialSmoother
+from domain.window_index import WindowIndex
+
+np = lazy_import("numpy")
 
 ValueType = Union[int, float, str]
 
 class VariableData:
     def __init__(self) -> None:
         self._values: Dict[datetime, ValueType] = {}
+        # Whole-history statistics, updated on every insertion
+        self.accumulator: StatsAccumulator = StatsAccumulator()
+        # Least-squares sums of the numeric values against time (not snapshotted: O(1) per value)
+        self.regression: RegressionAccumulator = RegressionAccumulator()
+        # Exponential smoothers built on demand (see smoother), then fed every new value
+        self._smoothers: Dict[str, ExponentialSmoother] = {}
+        # Bumped on every insertion; derived structures below are cached against it
+        self.version: int = 0
+        self._columns: Dict[bool, Tuple[int, np.ndarray, np.ndarray]] = {}
+        self._codes: Optional[Tuple[int, np.ndarray, List[ValueType]]] = None
+        self._objects: Optional[Tuple[int, np.ndarray]] = None
+        self._window_index: Optional[Tuple[int, WindowIndex]] = None
+        self._kind: str = "int"
 
-    def add(self, timestamp: datetime, value: ValueType) -> None:
+    def add(self, timestamp: datetime, value: ValueType, accumulate: bool = True) -> None:
+        """Store a value; accumulate=False leaves the accumulator alone (e.g. when restored from a snapshot)."""
+        previous = self._values.get(timestamp)
+        if accumulate:
+            if timestamp in self._values:
+                self.accumulator.remove(previous)
+            self.accumulator.add(value)
+        if StatsAccumulator.is_numeric(previous):
+            self.regression.remove(timestamp.timestamp(), previous)
+        if StatsAccumulator.is_numeric(value):
+            self.regression.add(timestamp.timestamp(), value)
+        for smoother in self._smoothers.values():
+            if StatsAccumulator.is_numeric(previous):
+                # A rewritten past value cannot be unwound from the state
+                smoother.stale = True
+            elif StatsAccumulator.is_numeric(value):
+                smoother.update(timestamp.timestamp(), value)
         self._values[timestamp] = value
+        self.version += 1
+
+    def current_accumulator(self) -> StatsAccumulator:
+        """The accumulator, with any stale part recomputed."""
+        if self.accumulator.needs_refresh:
+            self.accumulator.refresh(self._values.values())
+        return self.accumulator
+
+    def columns(self, sort: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Column views of the series: epoch-second timestamps (float64) and values.
+
+        Values form an int64 or a float64 array when all of them are ints or numbers, and an
+        object array otherwise (see value_kind). Insertion order by default, time order with
+        sort=True. Arrays are cached until the next insertion and must not be modified.
+        """
+        cached = self._columns.get(sort)
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+
+        n = len(self._values)
+        timestamps = np.fromiter((ts.timestamp() for ts in self._values), dtype=np.float64, count=n)
+        values = list(self._values.values())
+        kinds = {type(v) for v in values}
+        array = None
+        self._kind = "object"
+        if kinds <= {int}:
+            try:
+                array = np.array(values, dtype=np.int64)
+                self._kind = "int"
+            except OverflowError:
+                pass
+        elif kinds <= {int, float}:
+            array = np.array(values, dtype=np.float64)
+            self._kind = "float" if kinds == {float} else "number"
+        if array is None:
+            array = np.empty(n, dtype=object)
+            array[:] = values
+
+        if sort:
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, array = timestamps[order], array[order]
+
+        self._columns[sort] = (self.version, timestamps, array)
+        return timestamps, array
+
+    def value_kind(self) -> str:
+        """
+        'int' or 'float' when every value has that type, 'number' for a mix of ints and floats
+        (stored as float64 in columns()), 'object' otherwise.
+        """
+        self.columns()
+        return self._kind
+
+    def objects(self) -> np.ndarray:
+        """The original Python values as an object array, in insertion order."""
+        cached = self._objects
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        array = np.empty(len(self._values), dtype=object)
+        array[:] = list(self._values.values())
+        self._objects = (self.version, array)
+        return array
+
+    def codes(self) -> Tuple[np.ndarray, List[ValueType]]:
+        """
+        Factorized values in insertion order: codes[i] indexes uniques, and uniques are listed
+        in order of first occurrence. Cached until the next insertion.
+        """
+        cached = self._codes
+        if cached is not None and cached[0] == self.version:
+            return cached[1], cached[2]
+
+        _, values = self.columns()
+        if values.dtype != object:
+            # Numeric column: sort-based factorization, then renumber by first occurrence
+            distinct, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+            order = np.argsort(first, kind="stable")
+            rank = np.empty_like(order)
+            rank[order] = np.arange(len(order))
+            codes = rank[inverse.ravel()]
+            if self._kind == "number":
+                # 2 and 2.0 are one value: keep whichever came first, as a dict would
+                uniques = self.objects()[first[order]].tolist()
+            else:
+                uniques = distinct[order].tolist()
+        else:
+            index: Dict[ValueType, int] = {}
+            codes = np.fromiter(
+                (index.setdefault(v, len(index)) for v in values),
+                dtype=np.intp,
+                count=len(values),
+            )
+            uniques = list(index)
+        self._codes = (self.version, codes, uniques)
+        return codes, uniques
+
+    def numeric_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Time-sorted columns restricted to the numeric values (int64 or float64 values)."""
+        timestamps, values = self.columns(sort=True)
+        if values.dtype == object:
+            numeric = np.fromiter((isinstance(v, (int, float)) for v in values), dtype=bool, count=len(values))
+            timestamps = timestamps[numeric]
+            values = np.array(values[numeric].tolist(), dtype=np.float64)
+        return timestamps, values
+
+    def window_index(self) -> WindowIndex:
+        """
+        Time-window statistics index over the numeric values (non-numeric ones are left out),
+        rebuilt on first use after an insertion.
+        """
+        cached = self._window_index
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        index = WindowIndex(*self.numeric_columns())
+        self._window_index = (self.version, index)
+        return index
+
+    def smoother(self, method: str) -> ExponentialSmoother:
+        """
+        Exponential smoothing state ("simple", "holt" or "holt-winters") of the numeric values,
+        built from the series on first use, then kept up to date by add(). A state made stale by
+        an out-of-order or rewritten value is rebuilt here.
+        """
+        smoother = self._smoothers.get(method)
+        if smoother is None or smoother.stale:
+            smoother = ExponentialSmoother(method)
+            smoother.update_many(*self.numeric_columns())
+            self._smoothers[method] = smoother
+        return smoother
 
     def all_values(self) -> list[ValueType]:
         """Return all unique values, ignoring timestamps."""
@@ -23,7 +191,7 @@ class VariableData:
         return self._values[key]
 
     def __setitem__(self, key: datetime, value: ValueType) -> None:
-        self._values[key] = value
+        self.add(key, value)
 
     def __iter__(self) -> Iterator[datetime]:
         return iter(self._values)
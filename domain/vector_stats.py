@@ -0,0 +1,121 @@
+from __future__ import annotations
+from typing import Dict, Optional
+from domain.lazy import lazy_import
+
+from domain.domain import RangeDomain, EnumerationDomain, Domain, ValueType
+from domain.stats import Stats, DEFAULT_PERCENTILES
+from domain.variable import Variable
+
+np = lazy_import("numpy")
+
+
+class VectorStatsAnalyzer:
+    """
+    NumPy counterpart of StatsAnalyzer.compute, working on the variable's cached column views.
+
+    Returns the same Stats: counts, min, max, median, mode and frequencies are identical (including
+    int vs float results and first-occurrence tie-breaking); mean and std of float series agree to
+    floating-point rounding, and the mean of int series is exact as with the statistics module.
+    """
+
+    @staticmethod
+    def compute(variable: Variable, domain: Domain) -> Stats:
+        if isinstance(domain, RangeDomain):
+            return VectorStatsAnalyzer._range_stats(variable, domain)
+        if isinstance(domain, EnumerationDomain):
+            return VectorStatsAnalyzer._enumeration_stats(variable, domain)
+
+        # Fallback for unknown domain types
+        _, values = variable.data.columns()
+        return Stats(events=int(domain.mask(values).sum()))
+
+    @staticmethod
+    def _as_numeric(values: np.ndarray) -> np.ndarray:
+        if values.dtype != object:
+            return values
+        items = values.tolist()
+        if all(type(v) is int for v in items):
+            try:
+                return np.array(items, dtype=np.int64)
+            except OverflowError:
+                pass
+        return np.array(items, dtype=np.float64)
+
+    @staticmethod
+    def _mean(values: np.ndarray):
+        n = len(values)
+        if values.dtype.kind in "iu":
+            peak = max(abs(int(values.min())), abs(int(values.max())))
+            total = int(values.sum()) if peak * n < 2 ** 63 else sum(values.tolist())
+            # statistics.mean keeps an int result when the mean is integral
+            return total // n if total % n == 0 else total / n
+        return float(values.mean())
+
+    @staticmethod
+    def _median(values: np.ndarray, originals: Optional[np.ndarray]):
+        n = len(values)
+        mid = n // 2
+        if originals is None:
+            if n % 2:
+                return np.partition(values, mid)[mid].item()
+            part = np.partition(values, [mid - 1, mid])
+            return (part[mid - 1].item() + part[mid].item()) / 2
+        # Mixed ints and floats: a stable sort tells which original object statistics.median would pick
+        order = np.argsort(values, kind="stable")
+        if n % 2:
+            return originals[order[mid]]
+        return (originals[order[mid - 1]] + originals[order[mid]]) / 2
+
+    @staticmethod
+    def _mode_index(values: np.ndarray) -> int:
+        """Position of the most frequent value; ties go to the value occurring first, like max() over a frequency dict."""
+        _, first, counts = np.unique(values, return_index=True, return_counts=True)
+        return int(first[counts == counts.max()].min())
+
+    @staticmethod
+    def _range_stats(variable: Variable, domain: RangeDomain) -> Stats:
+        data = variable.data
+        _, values = data.columns()
+        mask = domain.mask(values)
+        selected = values[mask]
+        if not len(selected):
+            return Stats(events=0)
+
+        numeric = VectorStatsAnalyzer._as_numeric(selected)
+        # Where ints and floats are mixed, results are read back from the original objects to keep their type
+        originals = None
+        if numeric.dtype.kind == "f":
+            if selected.dtype == object:
+                originals = selected
+            elif data.value_kind() == "number":
+                originals = data.objects()[mask]
+
+        def pick(index: int):
+            return originals[index] if originals is not None else numeric[index].item()
+
+        return Stats(
+            events=len(numeric),
+            mean=VectorStatsAnalyzer._mean(numeric),
+            median=VectorStatsAnalyzer._median(numeric, originals),
+            std=float(numeric.std(ddof=1)) if len(numeric) > 1 else 0.0,
+            min=pick(int(numeric.argmin())),
+            max=pick(int(numeric.argmax())),
+            mode=pick(VectorStatsAnalyzer._mode_index(numeric)),
+            # Exact here, as the selection is already in memory
+            percentiles=dict(zip(DEFAULT_PERCENTILES, np.percentile(numeric, DEFAULT_PERCENTILES).tolist())),
+        )
+
+    @staticmethod
+    def _enumeration_stats(variable: Variable, domain: EnumerationDomain) -> Stats:
+        codes, uniques = variable.data.codes()
+        selected = codes[domain.mask_codes(codes, uniques)]
+        if not len(selected):
+            return Stats(events=0)
+
+        counts = np.bincount(selected, minlength=len(uniques))
+        freq: Dict[ValueType, int] = {uniques[i]: int(counts[i]) for i in np.flatnonzero(counts)}
+        return Stats(
+            events=len(selected),
+            frequencies=freq,
+            mode=uniques[int(np.argmax(counts))],
+        )
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Dict
+from domain.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+class WindowIndex:
+    """
+    Index over the time-sorted numeric values of a variable, answering time-window statistics
+    without scanning the window.
+
+    Prefix sums of the values and of their squares give count, mean and standard deviation in
+    O(log n) (two binary searches); values are shifted by the first one before summing, which
+    keeps the sum-of-squares variance numerically stable for series far from zero. Min/max
+    come from two segment trees in O(log n). Building is O(n) time and memory.
+    """
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray):
+        """`timestamps` (epoch seconds) must be sorted; `values` is an int64 or float64 array aligned with them."""
+        self.timestamps = timestamps
+        self.size = len(values)
+        self.shift = float(values[0]) if self.size else 0.0
+
+        centered = values.astype(np.float64) - self.shift
+        self._sums = np.concatenate(([0.0], np.cumsum(centered)))
+        self._squares = np.concatenate(([0.0], np.cumsum(centered * centered)))
+
+        if values.dtype.kind in "iu":
+            info = np.iinfo(values.dtype)
+            low, high = info.min, info.max
+        else:
+            low, high = -np.inf, np.inf
+        self._low, self._high = low, high
+        self._leaves = 1 << max(0, (self.size - 1).bit_length())
+        self._min_tree = self._build_tree(values, np.minimum, high)
+        self._max_tree = self._build_tree(values, np.maximum, low)
+
+    def _build_tree(self, values: np.ndarray, combine, padding) -> np.ndarray:
+        """Implicit binary tree: node k has children 2k and 2k + 1, leaves start at self._leaves."""
+        tree = np.full(2 * self._leaves, padding, dtype=values.dtype)
+        tree[self._leaves:self._leaves + self.size] = values
+        level = self._leaves
+        while level > 1:
+            tree[level // 2:level] = combine(tree[level:2 * level:2], tree[level + 1:2 * level:2])
+            level //= 2
+        return tree
+
+    def _reduce(self, tree: np.ndarray, combine, lo: np.ndarray, hi: np.ndarray, padding) -> np.ndarray:
+        """Combine tree leaves over [lo, hi) for every window at once, walking the levels bottom-up."""
+        result = np.full(len(lo), padding, dtype=tree.dtype)
+        lo = lo + self._leaves
+        hi = hi + self._leaves
+        while True:
+            active = lo < hi
+            if not active.any():
+                return result
+            take = active & (lo % 2 == 1)
+            result[take] = combine(result[take], tree[lo[take]])
+            lo = np.where(take, lo + 1, lo)
+            take = active & (hi % 2 == 1)
+            hi = np.where(take, hi - 1, hi)
+            result[take] = combine(result[take], tree[hi[take]])
+            lo //= 2
+            hi //= 2
+
+    def locate(self, starts, ends):
+        """Positions [lo, hi) of the values with start <= timestamp <= end."""
+        lo = np.searchsorted(self.timestamps, np.asarray(starts, dtype=np.float64), side="left")
+        hi = np.searchsorted(self.timestamps, np.asarray(ends, dtype=np.float64), side="right")
+        return lo, np.maximum(hi, lo)
+
+    def query(self, starts, ends) -> Dict[str, np.ndarray]:
+        """
+        Count, mean, std (sample), min and max of many windows [start, end] (epoch seconds), as
+        arrays aligned with `starts`/`ends`. Empty windows have count 0, NaN mean/std and
+        meaningless min/max.
+        """
+        lo, hi = self.locate(np.atleast_1d(starts), np.atleast_1d(ends))
+        count = hi - lo
+        total = self._sums[hi] - self._sums[lo]
+        squares = self._squares[hi] - self._squares[lo]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, self.shift + total / count, np.nan)
+            variance = (squares - total * total / count) / (count - 1)
+        std = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.where(count == 1, 0.0, np.nan))
+
+        minimum = self._reduce(self._min_tree, np.minimum, lo, hi, self._high)
+        maximum = self._reduce(self._max_tree, np.maximum, lo, hi, self._low)
+        return {"count": count, "mean": mean, "std": std, "min": minimum, "max": maximum}
@@ -30,6 +30,14 @@ class Env:
     def get_events_file_path(filename: str = "events.json") -> Path:
         return Env.base_path() / filename
 
+    @staticmethod
+    def get_snapshot_file_path(filename: str = "model_snapshot.json") -> Path:
+        return Env.base_path() / filename
+
+    @staticmethod
+    def get_socket_path(filename: str = "cli.sock") -> Path:
+        return Env.base_path() / filename
+
     @staticmethod
     def get_scripts_dir() -> Path:
         if getattr(sys, "frozen", False):
@@ -1,30 +1,46 @@
-import json
+import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from application.ports.i_repository import IRepository
 from domain.event import Event
 from domain.observable import Observable
 from infrastructure.environment.environment import Env
+from infrastructure.processing.json_codec import JsonCodec
 
 
 class JsonRepository(IRepository):
-    """Concrete repository using a JSON file."""
+    """
+    Concrete repository using JSON files.
 
-    def __init__(self):
-        self.observables_file_path: Path = Env.get_observables_file_path()
-        self.events_file_path: Path = Env.get_events_file_path()
+    Events live in a JSON array (events.json) followed by an append-only journal of JSON lines
+    (events.journal.jsonl) holding the batches appended since, so that a group commit costs
+    the size of the batch rather than of the whole history. save_events rewrites the array and
+    empties the journal.
+    """
+
+    def __init__(
+            self,
+            observables_file_path: Optional[Path] = None,
+            events_file_path: Optional[Path] = None,
+            snapshot_file_path: Optional[Path] = None,
+    ):
+        self.observables_file_path: Path = observables_file_path or Env.get_observables_file_path()
+        self.events_file_path: Path = events_file_path or Env.get_events_file_path()
+        self.snapshot_file_path: Path = snapshot_file_path or self.events_file_path.with_name(
+            Env.get_snapshot_file_path().name
+        )
+        self.journal_file_path: Path = self.events_file_path.with_suffix(".journal.jsonl")
         if not self.observables_file_path.exists():
             # initialize empty file
             self.save_observables([])
 
     def load_observables(self) -> List[Observable]:
-        with open(self.observables_file_path, "r", encoding="utf-8") as f:
-            raw_data = json.load(f)
+        raw_data = JsonCodec.load(self.observables_file_path)
 
         observables: List[Observable] = []
         for item in raw_data:
             try:
-                obs = Observable(name=item["name"], source=item["source"])
+                obs = Observable.from_dict(item)
                 observables.append(obs)
             except Exception as e:
                 print(f"Skipping invalid observable in storage: {item}, error: {e}")
@@ -32,10 +48,10 @@ class JsonRepository(IRepository):
 
     def load_events(self) -> List[Event]:
         try:
-            with open(self.events_file_path, "r", encoding="utf-8") as f:
-                raw_data = json.load(f)
+            raw_data = JsonCodec.load(self.events_file_path)
         except FileNotFoundError:
-            return []
+            raw_data = []
+        raw_data.extend(self._load_journal())
 
         events: List[Event] = []
         for item in raw_data:
@@ -46,11 +62,62 @@ class JsonRepository(IRepository):
         return events
 
     def save_observables(self, observables: List[Observable]) -> None:
-        data = [{"name": obs.name, "source": obs.source} for obs in observables]
-        with open(self.observables_file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        data = [obs.to_dict() for obs in observables]
+        # kept indented: this file is small and meant to be edited by hand
+        JsonCodec.dump(data, self.observables_file_path, pretty=True)
+
+    def _load_journal(self) -> List[dict]:
+        try:
+            with open(self.journal_file_path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+        items = []
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                items.append(JsonCodec.loads(line))
+            except ValueError:
+                # A write cut short by a crash leaves at most the last line incomplete
+                print(f"Skipping unreadable line {number} of {self.journal_file_path.name}")
+        return items
 
     def save_events(self, events: List[Event]) -> None:
         data = [event.to_dict() for event in events]
-        with open(self.events_file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        JsonCodec.dump(data, self.events_file_path)
+        self.journal_file_path.unlink(missing_ok=True)
+
+    def append_events(self, events: List[Event]) -> None:
+        """Append the batch to the journal, one JSON line per event."""
+        data = b"".join(JsonCodec.dumpb(event.to_dict()) + b"\n" for event in events)
+        with open(self.journal_file_path, "a+b") as f:
+            # Start on a fresh line if a previous append was cut short
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_snapshot(self) -> Optional[dict]:
+        try:
+            return JsonCodec.load(self.snapshot_file_path)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save_snapshot(self, snapshot: dict) -> None:
+        JsonCodec.dump(snapshot, self.snapshot_file_path)
+
+    def version(self) -> Optional[tuple]:
+        """Modification time and size of the observables, events, journal and snapshot files."""
+        token = []
+        for path in (self.observables_file_path, self.events_file_path, self.journal_file_path,
+                     self.snapshot_file_path):
+            try:
+                stat = path.stat()
+                token.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                token.append(None)
+        return tuple(token)
@@ -0,0 +1,87 @@
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class FileWatcher(ABC):
+    """
+    Reports which of a set of files changed since the last call to `changed`.
+
+    `create` returns an inotify-backed watcher when the optional `inotify_simple` package is
+    available (Linux), and a stat-polling watcher otherwise.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        self.paths: List[str] = [str(Path(p).resolve()) for p in paths]
+
+    @abstractmethod
+    def changed(self) -> List[str]:
+        """Paths of the watched files that changed since the previous call."""
+        pass
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def create(paths: Iterable[str], prefer_inotify: bool = True) -> "FileWatcher":
+        if prefer_inotify:
+            try:
+                return InotifyWatcher(paths)
+            except (ImportError, OSError):
+                pass
+        return PollingWatcher(paths)
+
+
+class PollingWatcher(FileWatcher):
+    """Compares (mtime, size) of every watched file with the values seen on the previous call."""
+
+    def __init__(self, paths: Iterable[str]):
+        super().__init__(paths)
+        self._signatures: Dict[str, Optional[Tuple[int, int]]] = {p: self._signature(p) for p in self.paths}
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def changed(self) -> List[str]:
+        changed: List[str] = []
+        for path in self.paths:
+            signature = self._signature(path)
+            if signature != self._signatures[path]:
+                self._signatures[path] = signature
+                changed.append(path)
+        return changed
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Watches the parent directories of the files, so that editors replacing a file through
+    a rename are noticed as well as in-place writes.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        from inotify_simple import INotify, flags
+
+        super().__init__(paths)
+        self._inotify = INotify()
+        mask = flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE
+        self._dirs: Dict[int, str] = {}
+        for directory in {os.path.dirname(p) for p in self.paths}:
+            self._dirs[self._inotify.add_watch(directory, mask)] = directory
+        self._watched = set(self.paths)
+
+    def changed(self) -> List[str]:
+        changed: List[str] = []
+        for event in self._inotify.read(timeout=0):
+            path = os.path.join(self._dirs.get(event.wd, ""), event.name)
+            if path in self._watched and path not in changed:
+                changed.append(path)
+        return changed
+
+    def close(self) -> None:
+        self._inotify.close()
@@ -0,0 +1,97 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, List, Union
+
+
+class JsonCodec:
+    """
+    Single entry point for JSON encoding/decoding.
+
+    Uses the fastest installed backend (orjson, then ujson) and falls back to the standard
+    library. Output is compact unless `pretty=True` is asked for.
+    """
+
+    backend: str = "json"
+    _loads: Callable[[Union[str, bytes]], Any] = staticmethod(json.loads)
+    _dumpb: Callable[[Any, bool], bytes] = None
+
+    @staticmethod
+    def available_backends() -> List[str]:
+        names = []
+        for name in ("orjson", "ujson"):
+            try:
+                __import__(name)
+                names.append(name)
+            except ImportError:
+                pass
+        return names + ["json"]
+
+    @classmethod
+    def use(cls, backend: str) -> None:
+        """Select a backend by name ('orjson', 'ujson' or 'json')."""
+        if backend == "orjson":
+            import orjson
+
+            def dumpb(obj, pretty):
+                try:
+                    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+                except TypeError:
+                    # e.g. integers beyond 64 bits or non-string keys
+                    return cls._stdlib_dumpb(obj, pretty)
+
+            cls._loads = staticmethod(orjson.loads)
+            cls._dumpb = staticmethod(dumpb)
+        elif backend == "ujson":
+            import ujson
+
+            def dumpb(obj, pretty):
+                return ujson.dumps(obj, ensure_ascii=False, indent=4 if pretty else 0).encode("utf-8")
+
+            cls._loads = staticmethod(ujson.loads)
+            cls._dumpb = staticmethod(dumpb)
+        elif backend == "json":
+            cls._loads = staticmethod(json.loads)
+            cls._dumpb = staticmethod(cls._stdlib_dumpb)
+        else:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        cls.backend = backend
+
+    @staticmethod
+    def _stdlib_dumpb(obj, pretty: bool) -> bytes:
+        if pretty:
+            text = json.dumps(obj, ensure_ascii=False, indent=4)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: Union[str, bytes, bytearray]) -> Any:
+        return cls._loads(data)
+
+    @classmethod
+    def dumpb(cls, obj: Any, pretty: bool = False) -> bytes:
+        return cls._dumpb(obj, pretty)
+
+    @classmethod
+    def dumps(cls, obj: Any, pretty: bool = False) -> str:
+        return cls._dumpb(obj, pretty).decode("utf-8")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Any:
+        with open(path, "rb") as f:
+            return cls._loads(f.read())
+
+    @classmethod
+    def dump(cls, obj: Any, path: Union[str, Path], pretty: bool = False) -> None:
+        """Write atomically: readers, and the file after a crash, see either the old or the new document."""
+        data = cls._dumpb(obj, pretty)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+
+
+JsonCodec.use(JsonCodec.available_backends()[0])
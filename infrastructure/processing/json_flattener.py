@@ -0,0 +1,122 @@
+from fnmatch import fnmatchcase
+import re
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+ScalarType = Union[str, int, float]
+
+
+class PathPattern:
+    """
+    A compiled path pattern over flattened JSON keys.
+
+    Segments are separated by '/' and matched with shell-style wildcards ('*', '?', '[...]'),
+    so 'items/*/price' selects the price of every element of items. A '**' segment matches any
+    number of segments. JSONPath-like patterns such as '$.items[*].price' are accepted too.
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.segments: Tuple[str, ...] = tuple(s for s in self._normalize(pattern).split("/") if s)
+
+    @staticmethod
+    def _normalize(pattern: str) -> str:
+        pattern = pattern.strip()
+        if pattern.startswith("$"):
+            pattern = pattern[1:].lstrip(".")
+            pattern = re.sub(r"\[(\*|\d+)\]", r"/\1", pattern)
+            pattern = re.sub(r"\[['\"]([^'\"]+)['\"]\]", r"/\1", pattern)
+            pattern = pattern.replace(".", "/")
+        return pattern
+
+    def _match(self, path: Sequence[str], i: int, j: int, prefix_ok: bool, partial_ok: bool) -> bool:
+        segments = self.segments
+        while True:
+            if i == len(segments):
+                # Pattern exhausted: a full match, or a match of one of the path's ancestors
+                return j == len(path) or prefix_ok
+            if j == len(path):
+                # Path exhausted with pattern left: some descendant of the path may still match
+                return partial_ok or all(s == "**" for s in segments[i:])
+            if segments[i] == "**":
+                return any(self._match(path, i + 1, k, prefix_ok, partial_ok) for k in range(j, len(path) + 1))
+            if not fnmatchcase(path[j], segments[i]):
+                return False
+            i += 1
+            j += 1
+
+    def matches(self, path: Sequence[str]) -> bool:
+        """The path itself matches the pattern."""
+        return self._match(path, 0, 0, prefix_ok=False, partial_ok=False)
+
+    def covers(self, path: Sequence[str]) -> bool:
+        """The path or one of its ancestors matches the pattern."""
+        return self._match(path, 0, 0, prefix_ok=True, partial_ok=False)
+
+    def may_cover_below(self, path: Sequence[str]) -> bool:
+        """The path, one of its ancestors or one of its descendants may match the pattern."""
+        return self._match(path, 0, 0, prefix_ok=True, partial_ok=True)
+
+    def __repr__(self) -> str:
+        return f"PathPattern({self.pattern!r})"
+
+
+class PathFilter:
+    """Include/exclude path patterns, compiled once and applied while a document is traversed."""
+
+    def __init__(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        self.include: List[PathPattern] = [PathPattern(p) for p in include or []]
+        self.exclude: List[PathPattern] = [PathPattern(p) for p in exclude or []]
+
+    def should_descend(self, path: Sequence[str]) -> bool:
+        """Whether the subtree at `path` can contain any kept value."""
+        if any(p.covers(path) for p in self.exclude):
+            return False
+        return not self.include or any(p.may_cover_below(path) for p in self.include)
+
+    def keeps(self, path: Sequence[str]) -> bool:
+        """Whether the scalar at `path` is kept."""
+        if any(p.covers(path) for p in self.exclude):
+            return False
+        return not self.include or any(p.covers(path) for p in self.include)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+
+class JsonFlattener:
+    """Flattens nested JSON documents into ('a/b/0/c', scalar) pairs."""
+
+    @staticmethod
+    def _children(node) -> Iterator[Tuple[str, object]]:
+        if isinstance(node, dict):
+            return iter(node.items())
+        return ((str(idx), v) for idx, v in enumerate(node))
+
+    @staticmethod
+    def flatten(data, path_filter: Optional[PathFilter] = None) -> Iterator[Tuple[str, ScalarType]]:
+        """
+        Yield the scalar leaves of `data` in document order.
+
+        The traversal is iterative and lazy; subtrees the filter rules out are never entered.
+        """
+        if not isinstance(data, (dict, list)):
+            if isinstance(data, (str, int, float)) and (not path_filter or path_filter.keeps(())):
+                yield "", data
+            return
+
+        stack: List[Tuple[Iterator[Tuple[str, object]], Tuple[str, ...]]] = [
+            (JsonFlattener._children(data), ())
+        ]
+        while stack:
+            children, prefix = stack[-1]
+            for key, value in children:
+                path = prefix + (key,)
+                if isinstance(value, (dict, list)):
+                    if not path_filter or path_filter.should_descend(path):
+                        stack.append((JsonFlattener._children(value), path))
+                        break
+                elif isinstance(value, (str, int, float)):
+                    if not path_filter or path_filter.keeps(path):
+                        yield "/".join(path), value
+            else:
+                stack.pop()
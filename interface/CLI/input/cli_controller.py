@@ -1,25 +1,142 @@
+import contextlib
+import csv
+import datetime
+import io
+import os
+import shlex
+import sys
+import time
+import traceback
+from typing import Dict, Iterable, List, Optional, Set, TextIO, Tuple
 from application.app import App
+from domain.lazy import lazy_import
 from interface.CLI.input.cli_parser import CLIParser
+from interface.CLI.input.cli_preprocessor import InputPreProcessor
 from interface.CLI.input.commands import *
 from infrastructure.persistence.json_repository import JsonRepository
+from infrastructure.processing.json_codec import JsonCodec
+
+np = lazy_import("numpy")
 
 
 class CLIController:
     @staticmethod
-    def execute(args: List[str]):
+    def execute_captured(args: List[str], app: App) -> Tuple[str, Optional[BaseException]]:
+        """Run a command against `app`, returning what it printed and the exception it raised (None on success)."""
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                CLIController.execute(args, app=app)
+        except (Exception, SystemExit) as e:
+            return output.getvalue(), e
+        return output.getvalue(), None
+
+    # Commands that hold the process (or start another batch) cannot run inside a batch
+    NOT_BATCHABLE = {"batch", "daemon", "ingest", "serve", "gui"}
+
+    @staticmethod
+    def run_batch(lines: Iterable[str], app: App, stream: TextIO, stop_on_error: bool = False) -> int:
+        """
+        Run one command per line against a shared App, writing one JSON object per command to
+        `stream` as soon as it completes: {"line", "command", "ok", "output", "error", "seconds"}.
+        Blank lines and # comments are skipped; arguments are split like a shell would, with
+        quotes but without backslash escapes (Windows paths are kept). Returns the failure count.
+        """
+        failures = 0
+        for number, line in enumerate(lines, start=1):
+            started = time.perf_counter()
+            output, error = "", None
+            try:
+                lexer = shlex.shlex(line, posix=True)
+                lexer.whitespace_split, lexer.escape, lexer.commenters = True, "", "#"
+                args = [InputPreProcessor.normalize(arg) for arg in lexer]
+            except ValueError as e:
+                args, error = [line.strip()], f"ValueError: {e}"
+            if not args:
+                continue
+            if error is None:
+                if args[0] in CLIController.NOT_BATCHABLE:
+                    error = f"{args[0]} cannot run in a batch"
+                else:
+                    output, failure = CLIController.execute_captured(args, app)
+                    if failure is not None:
+                        error = "".join(traceback.format_exception_only(failure)).strip()
+            failures += error is not None
+            record = {
+                "line": number,
+                "command": args,
+                "ok": error is None,
+                "output": output,
+                "error": error,
+                "seconds": round(time.perf_counter() - started, 6),
+            }
+            stream.write(JsonCodec.dumps(record) + "\n")
+            stream.flush()
+            if error is not None and stop_on_error:
+                break
+        return failures
+
+    @staticmethod
+    def _write_table(columns: Dict[str, "np.ndarray"], times: Set[str], cmd) -> None:
+        """Stream columns in the command's --format to --out or stdout (see TableWriter)."""
+        from interface.CLI.output.table_writer import TableWriter
+        writer = TableWriter(cmd.format or TableWriter.infer_format(cmd.out), times)
+        try:
+            rows = writer.write(TableWriter.select(columns, cmd.columns), cmd.out)
+        except BrokenPipeError:
+            # The reader stopped early (e.g. `| head`): no traceback, and nothing more to flush at exit
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            sys.exit(1)
+        if cmd.out:
+            print(f"{rows} rows written to {cmd.out}")
+
+    @staticmethod
+    def _plot_columns(plot_data, app: App, start=None, end=None) -> Tuple[Dict[str, "np.ndarray"], Set[str]]:
+        """
+        PlotData as columns x, y, its extra series by name and the bar width, with time-axis x
+        as epoch seconds (the time columns returned) filtered to [start, end].
+        """
+        def column(values) -> "np.ndarray":
+            array = np.asarray(values)
+            # Mixed or textual values stay Python objects rather than being coerced to strings
+            return array if array.dtype.kind in "biuf" else np.array(values, dtype=object)
+
+        by_time = bool(plot_data.x) and isinstance(plot_data.x[0], datetime.datetime)
+        columns = {
+            "x": np.fromiter((t.timestamp() for t in plot_data.x), dtype=np.float64, count=len(plot_data.x))
+            if by_time else column(plot_data.x),
+            "y": column(plot_data.y),
+        }
+        for name, values in (plot_data.series or {}).items():
+            columns[name] = column(values)
+        if plot_data.widths:
+            columns["width"] = column(plot_data.widths)
+
+        if start is not None or end is not None:
+            if not by_time:
+                raise ValueError(f"--start/--end filter time-based plots; a {plot_data.plot_type} plot has no time axis")
+            lo, hi = app.time_bounds(start, end)
+            keep = (columns["x"] >= lo) & (columns["x"] <= hi)
+            columns = {name: values[keep] for name, values in columns.items()}
+        return columns, {"x"} if by_time else set()
+
+    @staticmethod
+    def execute(args: List[str], app: Optional[App] = None):
+        """Run a command, against `app` when given (e.g. the serve command's resident App)."""
 
         command_name = args[0]
         options = args[1:]
         cmd = CLIParser.parse_as_command(command_name, options)
 
-        app = App(JsonRepository())
+        app = app or App(JsonRepository())
 
         if isinstance(cmd, CLIHelpCommand):
             cli_help_instructions = app.cli_help()
             print(cli_help_instructions)
 
         if isinstance(cmd, NewObservableCommand):
-            app.new_observable(cmd.observable_name, cmd.source)
+            app.new_observable(cmd.observable_name, cmd.source, cmd.interval, cmd.include, cmd.exclude)
 
         if isinstance(cmd, ListObservablesCommand):
             print(app.list_observables())
@@ -34,6 +151,7 @@ class CLIController:
             print(app.list_variables(cmd.object_name))
 
         if isinstance(cmd, NewEventCommand):
+            app.dedup = cmd.dedup
             app.new_event()
 
         if isinstance(cmd, ComputeStatsWithinRangeCommand):
@@ -45,12 +163,40 @@ class CLIController:
             )
 
         if isinstance(cmd, ComputeStatsForValuesCommand):
-            app.compute_stats_for_values(
+            stats = app.compute_stats_for_values(
                 cmd.object_name,
                 cmd.variable_name
             )
+            for field in ("events", "mode", "approximate"):
+                if getattr(stats, field) is not None:
+                    print(f"{field}: {getattr(stats, field)}")
+            for value, count, error in stats.top_values or []:
+                print(f"  {value}: {count}" + (f" ±{error}" if error else ""))
+
+        if isinstance(cmd, ComputeStatsWindowCommand):
+            stats = app.compute_stats_window(cmd.object_name, cmd.variable_name, cmd.start, cmd.end)
+            for field in ("events", "mean", "std", "min", "max"):
+                print(f"{field}: {getattr(stats, field)}")
+
+        if isinstance(cmd, ComputeTopValuesCommand):
+            for value, count, error in app.compute_top_values(cmd.object_name, cmd.variable_name, cmd.n):
+                print(f"{value}: {count}" + (f" ±{error}" if error else ""))
+
+        if isinstance(cmd, ComputePercentilesCommand):
+            percentiles = app.compute_percentiles(
+                cmd.object_name,
+                cmd.variable_name,
+                cmd.percentiles,
+                cmd.compression
+            )
+            for p, value in percentiles.items():
+                print(f"p{p:g}: {value}")
 
-        if isinstance(cmd, GetVariableDataCommand):
+        if isinstance(cmd, GetVariableDataCommand) and cmd.format is not None:
+            timestamps, values = app.get_variable_columns(cmd.object_name, cmd.variable_name, cmd.start, cmd.end)
+            CLIController._write_table({"time": timestamps, "value": values}, {"time"}, cmd)
+
+        elif isinstance(cmd, GetVariableDataCommand):
             variable_data = app.get_variable_data(
                 cmd.object_name,
                 cmd.variable_name
@@ -66,6 +212,81 @@ class CLIController:
                 cmd.object_name,
                 cmd.variable_name,
                 cmd.plot_type,
-                variable_data
+                variable_data,
+                window=cmd.window,
+                resample=cmd.resample,
+                aggregation=cmd.aggregation,
+                bins=cmd.bins
+            )
+            if cmd.format is None:
+                print(plot_data)
+            else:
+                columns, times = CLIController._plot_columns(plot_data, app, cmd.start, cmd.end)
+                CLIController._write_table(columns, times, cmd)
+
+        if isinstance(cmd, ResampleCommand):
+            times, values = app.resample(cmd.object_name, cmd.variable_name, cmd.interval, cmd.aggregation)
+            for moment, value in zip(times, values):
+                print(f"{moment.isoformat()}\t{value}")
+
+        if isinstance(cmd, CacheStatsCommand):
+            for key, value in app.cache_stats().items():
+                print(f"{key}: {value}")
+
+        if isinstance(cmd, ForecastAllCommand):
+            columns = app.forecast_all(cmd.method, cmd.horizon, cmd.step, cmd.resample)
+            times = np.datetime_as_string((columns["time"] * 1e6).astype("datetime64[us]"), unit="s", timezone="UTC")
+            stream = open(cmd.out, "w", newline="") if cmd.out else sys.stdout
+            try:
+                writer = csv.writer(stream)
+                writer.writerow(["object", "variable", "time", "value"])
+                writer.writerows(zip(columns["object"], columns["variable"], times, columns["value"].tolist()))
+            finally:
+                if cmd.out:
+                    stream.close()
+
+        # Long-running commands import their machinery on demand, keeping other commands' startup short
+        if isinstance(cmd, DaemonCommand):
+            from application.collector import Collector
+            app.dedup = cmd.dedup
+            collector = Collector(
+                app,
+                default_interval=cmd.interval,
+                jitter=cmd.jitter,
+                batch_size=cmd.batch_size,
+                flush_interval=cmd.flush_interval,
+                adaptive=cmd.adaptive,
+                min_interval=cmd.min_interval,
+                max_interval=cmd.max_interval,
+                threshold=cmd.threshold,
+                fetch_budget=cmd.fetch_budget,
+                watch=cmd.watch,
+                poll_interval=cmd.poll_interval,
+            )
+            collector.run()
+
+        if isinstance(cmd, BatchCommand):
+            if cmd.source == "-":
+                failures = CLIController.run_batch(sys.stdin, app, sys.stdout, cmd.stop_on_error)
+            else:
+                with open(cmd.source, encoding="utf-8") as lines:
+                    failures = CLIController.run_batch(lines, app, sys.stdout, cmd.stop_on_error)
+            if failures:
+                sys.exit(1)
+
+        if isinstance(cmd, ServeCommand):
+            from interface.CLI.server.cli_server import CLIServer
+            CLIServer(app, cmd.socket).serve_forever()
+
+        if isinstance(cmd, IngestCommand):
+            from interface.ingest.ingest_server import IngestServer
+            app.dedup = cmd.dedup
+            server = IngestServer(
+                app,
+                host=cmd.host,
+                port=cmd.port,
+                batch_size=cmd.batch_size,
+                flush_interval=cmd.flush_interval,
+                queue_size=cmd.queue_size,
             )
-            print(plot_data)
+            server.serve_forever()
@@ -2,18 +2,33 @@ from interface.CLI.input.commands import *
 
 
 class CLIParser:
+    # Command classes by command name
+    COMMANDS: Dict[str, type] = {
+        "help"                  : CLIHelpCommand,
+        "new-observable"        : NewObservableCommand,
+        "list-observables"      : ListObservablesCommand,
+        "list-objects"          : ListObjectsCommand,
+        "list-variables"        : ListVariablesCommand,
+        "list-scripts"          : ListScriptsCommand,
+        "new-event"             : NewEventCommand,
+        "compute-stats-range"   : ComputeStatsWithinRangeCommand,
+        "compute-stats-values"  : ComputeStatsForValuesCommand,
+        "compute-stats-window"  : ComputeStatsWindowCommand,
+        "compute-top-values"    : ComputeTopValuesCommand,
+        "compute-percentiles"   : ComputePercentilesCommand,
+        "get-variable-data"     : GetVariableDataCommand,
+        "get-plot-data"         : GetPlotDataCommand,
+        "resample"              : ResampleCommand,
+        "cache-stats"           : CacheStatsCommand,
+        "forecast-all"          : ForecastAllCommand,
+        "daemon"                : DaemonCommand,
+        "ingest"                : IngestCommand,
+        "serve"                 : ServeCommand,
+        "batch"                 : BatchCommand,
+    }
+
     @staticmethod
     def parse_as_command(command_name: str, args: List[str]) -> Command:
-        return {
-            "help"                  : CLIHelpCommand,
-            "new-observable"        : NewObservableCommand,
-            "list-observables"      : ListObservablesCommand,
-            "list-objects"          : ListObjectsCommand,
-            "list-variables"        : ListVariablesCommand,
-            "list-scripts"          : ListScriptsCommand,
-            "new-event"             : NewEventCommand,
-            "compute-stats-range"   : ComputeStatsWithinRangeCommand,
-            "compute-stats-values"  : ComputeStatsForValuesCommand,
-            "get-variable-data"     : GetVariableDataCommand,
-            "get-plot-data"         : GetPlotDataCommand
-        }[command_name](args)
\ No newline at end of file
+        if command_name not in CLIParser.COMMANDS:
+            raise ValueError(f"Unknown command: {command_name} (see help)")
+        return CLIParser.COMMANDS[command_name](args)
\ No newline at end of file
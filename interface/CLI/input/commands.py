@@ -1,5 +1,44 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Collection, List, Dict, Tuple
+
+
+def split_options(args: List[str], flags: Collection[str] = ()) -> Tuple[List[str], Dict[str, str]]:
+    """
+    Separate positional arguments from `--key value` options (a bare `--flag` maps to "true").
+    Keys in `flags` are booleans: they only take an explicit true/false after them, so that
+    `--flag <argument>` leaves the argument positional.
+    """
+    positional: List[str] = []
+    options: Dict[str, str] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--"):
+            key = arg[2:]
+            takes_value = key not in flags or (i + 1 < len(args) and args[i + 1].lower() in ("true", "false"))
+            if takes_value and i + 1 < len(args) and not args[i + 1].startswith("--"):
+                options[key] = args[i + 1]
+                i += 2
+                continue
+            options[key] = "true"
+        else:
+            positional.append(arg)
+        i += 1
+    return positional, options
+
+
+def add_output_options(command, options: Dict[str, str]) -> None:
+    """
+    Machine-readable output options: --format json|jsonl|csv|npy, --out <file>, --start/--end
+    time filters and --columns a,b. `command.format` stays None when none is given.
+    """
+    command.out = options.get("out")
+    command.start = options.get("start")
+    command.end = options.get("end")
+    command.columns = [c.strip() for c in options["columns"].split(",") if c.strip()] if "columns" in options else None
+    command.format = options.get("format")
+    if command.format is None and any(key in options for key in ("out", "start", "end", "columns")):
+        command.format = ""  # inferred from --out, csv by default
 
 
 @dataclass
@@ -22,8 +61,12 @@ class NewObservableCommand(Command):
     def __init__(cls, args: list[str]):
         cls.name = cls.command_name()
         cls.args = args
-        cls.observable_name = args[0]
-        cls.source = args[1]
+        positional, options = split_options(args)
+        cls.observable_name = positional[0]
+        cls.source = positional[1]
+        cls.interval = float(options["interval"]) if "interval" in options else None
+        cls.include = [p for p in options.get("include", "").split(",") if p]
+        cls.exclude = [p for p in options.get("exclude", "").split(",") if p]
 
 
 @dataclass
@@ -86,6 +129,8 @@ class NewEventCommand(Command):
     def __init__(cls, args: list[str]):
         cls.name = cls.command_name()
         cls.args = args
+        _, options = split_options(args, flags={"dedup"})
+        cls.dedup = options.get("dedup", "false").lower() == "true"
 
 @dataclass
 class ComputeStatsWithinRangeCommand(Command):
@@ -113,28 +158,173 @@ class ComputeStatsForValuesCommand(Command):
     def command_name(cls) -> str:
         return "compute-stats-values"
 
-class GetVariableDataCommand(Command):
+class CacheStatsCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "cache-stats"
+
+class ComputeStatsWindowCommand(Command):
     def __init__(self, args: list[str]):
         self.name = self.command_name()
         self.args = args
         self.object_name = args[0]
         self.variable_name = args[1]
+        self.start = None if args[2] == "-" else args[2]
+        self.end = None if args[3] == "-" else args[3]
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "compute-stats-window"
+
+class ComputeTopValuesCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        self.object_name = args[0]
+        self.variable_name = args[1]
+        self.n = int(args[2]) if len(args) > 2 else 10
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "compute-top-values"
+
+class ComputePercentilesCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args)
+        self.object_name = positional[0]
+        self.variable_name = positional[1]
+        self.percentiles = [float(p) for p in positional[2:]] or None
+        self.compression = float(options["compression"]) if "compression" in options else None
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "compute-percentiles"
+
+class GetVariableDataCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args)
+        self.object_name = positional[0]
+        self.variable_name = positional[1]
+        add_output_options(self, options)
 
     @classmethod
     def command_name(cls) -> str:
         return "get-variable-data"
 
 class GetPlotDataCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args)
+        self.object_name = positional[0]
+        self.variable_name = positional[1]
+        self.plot_type = positional[2]
+        self.window = options.get("window")
+        self.resample = options.get("resample")
+        self.aggregation = options.get("aggregation", "mean")
+        self.bins = options.get("bins", "fixed")
+        add_output_options(self, options)
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "get-plot-data"
+
+class ResampleCommand(Command):
     def __init__(self, args: list[str]):
         self.name = self.command_name()
         self.args = args
         self.object_name = args[0]
         self.variable_name = args[1]
-        self.plot_type = args[2]
+        self.interval = args[2]
+        self.aggregation = args[3] if len(args) > 3 else "mean"
 
     @classmethod
     def command_name(cls) -> str:
-        return "get-plot-data"
+        return "resample"
+
+class ForecastAllCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        _, options = split_options(args)
+        self.method = options.get("method", "linear")
+        self.horizon = options.get("horizon", "7d")
+        self.step = options.get("step", "1d")
+        self.resample = options.get("resample")
+        self.out = options.get("out")
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "forecast-all"
+
+class DaemonCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args, flags={"adaptive", "watch", "dedup"})
+        self.interval = float(positional[0]) if positional else 60.0
+        self.jitter = float(options.get("jitter", 0.1))
+        self.batch_size = int(options.get("batch-size", 50))
+        self.flush_interval = float(options.get("flush-interval", 10.0))
+        self.adaptive = options.get("adaptive", "false").lower() == "true"
+        self.min_interval = float(options.get("min-interval", 1.0))
+        self.max_interval = float(options.get("max-interval", 3600.0))
+        self.threshold = float(options.get("threshold", 0.05))
+        self.fetch_budget = float(options["fetch-budget"]) if "fetch-budget" in options else None
+        self.watch = options.get("watch", "false").lower() == "true"
+        self.poll_interval = float(options.get("poll-interval", 1.0))
+        self.dedup = options.get("dedup", "false").lower() == "true"
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "daemon"
+
+class ServeCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        _, options = split_options(args)
+        self.socket = options.get("socket")
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "serve"
+
+class BatchCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args, flags={"stop-on-error"})
+        self.source = positional[0] if positional else "-"  # "-" reads stdin
+        self.stop_on_error = options.get("stop-on-error", "false").lower() == "true"
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "batch"
+
+class IngestCommand(Command):
+    def __init__(self, args: list[str]):
+        self.name = self.command_name()
+        self.args = args
+        positional, options = split_options(args, flags={"dedup"})
+        self.port = int(positional[0]) if positional else 8765
+        self.host = options.get("host", "127.0.0.1")
+        self.batch_size = int(options.get("batch-size", 1000))
+        self.flush_interval = float(options.get("flush-interval", 1.0))
+        self.queue_size = int(options.get("queue-size", 10000))
+        self.dedup = options.get("dedup", "false").lower() == "true"
+
+    @classmethod
+    def command_name(cls) -> str:
+        return "ingest"
 
 @dataclass
 class CLIHelpCommand(Command):
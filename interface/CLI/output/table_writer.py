@@ -0,0 +1,137 @@
+from __future__ import annotations
+import contextlib
+import csv
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from domain.lazy import lazy_import
+from infrastructure.processing.json_codec import JsonCodec
+
+np = lazy_import("numpy")
+
+
+class TableWriter:
+    """
+    Streams a table of equal-length column arrays, `chunk_size` rows at a time, so that output
+    memory stays constant however long the series:
+
+      - "csv": a header line, then one line per row;
+      - "jsonl": one JSON object per row;
+      - "json": a single JSON array of row objects, written incrementally;
+      - "npy": a NumPy structured array (one field per column), for numeric or text columns.
+
+    Columns named in `times` hold epoch seconds: they are written as ISO 8601 (UTC) in text
+    formats and as datetime64[us] in npy.
+    """
+
+    FORMATS = ("json", "jsonl", "csv", "npy")
+
+    def __init__(self, fmt: str = "csv", times: Iterable[str] = (), chunk_size: int = 10000):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown output format: {fmt} (expected one of {', '.join(self.FORMATS)})")
+        self.format = fmt
+        self.times = set(times)
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def infer_format(cls, out: Optional[str], default: str = "csv") -> str:
+        """The format named by an output file's extension (e.g. .jsonl), else the default."""
+        suffix = Path(out).suffix.lstrip(".").lower() if out else ""
+        return suffix if suffix in cls.FORMATS else default
+
+    @staticmethod
+    def select(columns: Dict[str, np.ndarray], names: Optional[List[str]]) -> Dict[str, np.ndarray]:
+        """The named columns, in the given order (all columns when names is empty)."""
+        if not names:
+            return columns
+        unknown = [name for name in names if name not in columns]
+        if unknown:
+            raise ValueError(f"Unknown column(s): {', '.join(unknown)} (available: {', '.join(columns)})")
+        return {name: columns[name] for name in names}
+
+    def write(self, columns: Dict[str, np.ndarray], out: Optional[str] = None) -> int:
+        """Write the table to the `out` file (stdout when None) and return the number of rows."""
+        binary = self.format == "npy"
+        with contextlib.ExitStack() as stack:
+            if out and binary:
+                stream = stack.enter_context(open(out, "wb"))
+            elif out:
+                stream = stack.enter_context(open(out, "w", newline="", encoding="utf-8"))
+            elif binary:
+                # Captured output (batch, serve) has no binary buffer
+                stream = getattr(sys.stdout, "buffer", None)
+                if stream is None:
+                    raise ValueError("npy output cannot go to this stdout; write it to a file with --out")
+            else:
+                stream = sys.stdout
+            if binary:
+                return self._write_npy(columns, stream)
+            return self._write_text(columns, stream)
+
+    def _length(self, columns: Dict[str, np.ndarray]) -> int:
+        return len(next(iter(columns.values()))) if columns else 0
+
+    def _chunks(self, columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, list]]:
+        """Successive row slices as Python lists, epoch-second columns rendered as ISO strings."""
+        for start in range(0, self._length(columns), self.chunk_size):
+            chunk = {}
+            for name, column in columns.items():
+                part = column[start:start + self.chunk_size]
+                if name in self.times:
+                    part = np.datetime_as_string(self._datetimes(part), unit="us", timezone="UTC")
+                chunk[name] = part.tolist()
+            yield chunk
+
+    @staticmethod
+    def _datetimes(epoch: np.ndarray) -> np.ndarray:
+        return np.round(np.asarray(epoch, dtype=np.float64) * 1e6).astype("datetime64[us]")
+
+    def _write_text(self, columns: Dict[str, np.ndarray], stream) -> int:
+        names = list(columns)
+        rows = 0
+        if self.format == "csv":
+            writer = csv.writer(stream)
+            writer.writerow(names)
+        elif self.format == "json":
+            stream.write("[")
+        for chunk in self._chunks(columns):
+            records = zip(*(chunk[name] for name in names))
+            if self.format == "csv":
+                writer.writerows(records)
+            else:
+                lines = [JsonCodec.dumps(dict(zip(names, record))) for record in records]
+                if self.format == "json":
+                    stream.write(("," if rows else "") + "\n" + ",\n".join(lines))
+                else:
+                    stream.write("\n".join(lines) + "\n")
+            rows += len(chunk[names[0]]) if names else 0
+        if self.format == "json":
+            stream.write("\n]\n")
+        stream.flush()
+        return rows
+
+    def _write_npy(self, columns: Dict[str, np.ndarray], stream) -> int:
+        fields = []
+        for name, column in columns.items():
+            if name in self.times:
+                fields.append((name, "datetime64[us]"))
+            elif column.dtype == object:
+                # Categorical values become fixed-width strings; mixed values have no npy field type
+                if not all(isinstance(value, str) for value in column):
+                    raise ValueError(f"npy output needs numeric or text columns, but {name!r} holds mixed values")
+                fields.append((name, f"U{max(map(len, column), default=1) or 1}"))
+            else:
+                fields.append((name, column.dtype))
+        dtype = np.dtype(fields)
+        length = self._length(columns)
+        header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (length,)}
+        np.lib.format.write_array_header_1_0(stream, header)
+        for start in range(0, length, self.chunk_size):
+            block = np.empty(min(self.chunk_size, length - start), dtype=dtype)
+            for name, column in columns.items():
+                part = column[start:start + self.chunk_size]
+                block[name] = self._datetimes(part) if name in self.times else part
+            stream.write(block.tobytes())
+        stream.flush()
+        return length
@@ -0,0 +1,65 @@
+import os
+import socket
+from pathlib import Path
+from typing import List, Optional
+
+from infrastructure.environment.environment import Env
+from infrastructure.processing.json_codec import JsonCodec
+
+
+class CLIClient:
+    """
+    Forwards CLI commands to a running CLIServer (see the serve command).
+
+    Long-running commands, and those that need the caller's terminal, always run locally.
+    When no server accepts the connection within `connect_timeout` seconds, send() returns None
+    and the caller runs the command itself. Once sent, a command is never run again locally:
+    the server may still be executing it, so a lost reply (or no reply within the optional
+    `timeout`) comes back as an error.
+    """
+
+    LOCAL_COMMANDS = {"serve", "daemon", "ingest", "gui", "batch"}
+    # Table output options stream straight to stdout or a file, which a forwarded reply cannot
+    STREAMED_COMMANDS = {"get-variable-data", "get-plot-data"}
+    STREAMED_OPTIONS = {"--format", "--out", "--start", "--end", "--columns"}
+    CONNECT_TIMEOUT = 2.0
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: Optional[float] = None,
+                 connect_timeout: float = CONNECT_TIMEOUT):
+        self.socket_path = Path(socket_path or Env.get_socket_path())
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+
+    def forwards(self, args: List[str]) -> bool:
+        if not args or args[0] in self.LOCAL_COMMANDS:
+            return False
+        if args[0] in self.STREAMED_COMMANDS and self.STREAMED_OPTIONS.intersection(args):
+            return False
+        return hasattr(socket, "AF_UNIX") and self.socket_path.exists()
+
+    def send(self, args: List[str]) -> Optional[dict]:
+        """The server's reply ({"output", "error"}), or None when no server answers."""
+        if not self.forwards(args):
+            return None
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(self.connect_timeout)
+        try:
+            connection.connect(str(self.socket_path))
+        except OSError:
+            # Stale socket file or unresponsive server: nothing was sent, the caller runs it
+            connection.close()
+            return None
+        connection.settimeout(self.timeout)
+        try:
+            with connection, connection.makefile("rb") as replies:
+                connection.sendall(JsonCodec.dumpb({"args": args, "cwd": os.getcwd()}) + b"\n")
+                line = replies.readline()
+        except OSError as e:
+            # socket.timeout is an OSError
+            line, failure = b"", e or "timed out"
+        else:
+            failure = "connection closed"
+        if not line:
+            return {"output": "", "error": f"No reply from the CLI server at {self.socket_path} ({failure}); "
+                                           f"the command may still have run there.\n"}
+        return JsonCodec.loads(line)
@@ -0,0 +1,109 @@
+import contextlib
+import os
+import signal
+import socket
+import socketserver
+import traceback
+from pathlib import Path
+from typing import Optional
+
+from application.app import App
+from infrastructure.environment.environment import Env
+from infrastructure.processing.json_codec import JsonCodec
+
+
+class CLIServer:
+    """
+    Keeps an App resident and runs CLI commands sent by CLIClient over a Unix socket, so that a
+    query does not pay for reloading observables, events and the model every time.
+
+    Each connection carries one request line {"args": [...], "cwd": "..."} and gets one reply
+    line {"output": "...", "error": null | "traceback"}. Commands run one at a time, in the
+    client's working directory, with their printed output captured. Before each command the App
+    reloads from the repository if its files changed since it loaded them (another process
+    writing events, for instance), and warm caches are otherwise kept between commands.
+    """
+
+    def __init__(self, app: App, socket_path: Optional[Path] = None):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not supported on this platform")
+        self.app = app
+        self.socket_path = Path(socket_path or Env.get_socket_path())
+        self.served = 0
+        self._remove_stale_socket()
+        self.server = socketserver.UnixStreamServer(str(self.socket_path), self._handler_class())
+
+    def _remove_stale_socket(self) -> None:
+        if not self.socket_path.exists():
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except OSError:
+            # Left behind by a server that did not shut down cleanly
+            self.socket_path.unlink()
+        else:
+            raise OSError(f"A server is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+    def run(self, args, cwd: Optional[str] = None) -> dict:
+        """Execute one command against the resident App and capture what it prints."""
+        # Imported here: the controller itself imports this module for the serve command
+        from interface.CLI.input.cli_controller import CLIController
+
+        previous_cwd = os.getcwd()
+        try:
+            if cwd:
+                os.chdir(cwd)
+            self.app.reload_if_stale()
+            output, failure = CLIController.execute_captured(list(args), self.app)
+        except Exception as e:
+            output, failure = "", e
+        finally:
+            os.chdir(previous_cwd)
+        self.served += 1
+        error = "".join(traceback.format_exception(failure)) if failure else None
+        return {"output": output, "error": error}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline()
+                if not line.strip():
+                    return
+                try:
+                    request = JsonCodec.loads(line)
+                    reply = server.run(request["args"], request.get("cwd"))
+                except (ValueError, KeyError, TypeError) as e:
+                    reply = {"output": "", "error": f"Invalid request: {e}"}
+                try:
+                    self.wfile.write(JsonCodec.dumpb(reply) + b"\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up waiting; the command has run regardless
+                    print("Client left before its reply was written.")
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        print(f"Serving CLI commands on {self.socket_path} (Ctrl+C to stop).")
+
+        def stop(signum, frame):
+            raise KeyboardInterrupt
+
+        # Stopped by a service manager: clean up the socket as on Ctrl+C
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self) -> None:
+        self.server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+        print(f"CLI server stopped after {self.served} commands.")
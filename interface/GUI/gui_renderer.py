@@ -367,7 +367,7 @@ class GUIRenderer:
             self.gui.left_frame,
             "plots",
             var_name="plot_var",
-            values=["time series", "distribution"],
+            values=["time series", "distribution", "rolling"],
             button=("🞂", self.plot_data, 5),  # small plot button
         )
 
@@ -425,6 +425,17 @@ class GUIRenderer:
         )
         self.resolution_spinbox.grid(row=0, column=1, sticky="w")
 
+        # Bin strategy: "fixed" uses the resolution as bin width (10^-resolution)
+        self.bins_var = tk.StringVar(value="fixed")
+        ttk.Combobox(
+            self.resolution_frame,
+            textvariable=self.bins_var,
+            values=["fixed", "fd", "sturges", "quantile"],
+            width=8,
+            state="readonly",
+            style=f"{self.style.prefix}.TCombobox",
+        ).grid(row=0, column=2, sticky="w", padx=(4, 0))
+
         # Function to show/hide the resolution row
         def update_resolution_visibility(*args):
             if self.gui.plot_var.get() == "distribution":
@@ -443,16 +454,90 @@ class GUIRenderer:
         update_resolution_visibility()
         self.resolution_var.set(2)
 
+        # Rolling window: a number of samples ("20") or a duration ("15m", "1h", "1d")
+        self.window_frame = ttk.Frame(self.gui.left_frame)
+        ttk.Label(
+            self.window_frame,
+            text="window:",
+            style=f"{self.style.prefix}.TLabel"
+        ).grid(row=0, column=0, sticky="w", padx=(12, 4))
+        self.window_var = tk.StringVar(value="20")
+        tk.Entry(
+            self.window_frame,
+            textvariable=self.window_var,
+            width=6,
+            background="#dcdad5",
+        ).grid(row=0, column=1, sticky="w")
+
+        def update_window_visibility(*args):
+            if self.gui.plot_var.get() == "rolling":
+                self.window_frame.pack(fill="x", pady=2, anchor="w", after=max_frame)
+            else:
+                self.window_frame.pack_forget()
+
+        self.gui.plot_var.trace_add("write", update_window_visibility)
+        update_window_visibility()
+
+        # Time series resampling: bucket interval and aggregation
+        self.resample_frame = ttk.Frame(self.gui.left_frame)
+        ttk.Label(
+            self.resample_frame,
+            text="bucket:",
+            style=f"{self.style.prefix}.TLabel"
+        ).grid(row=0, column=0, sticky="w", padx=(12, 4))
+        self.resample_var = tk.StringVar(value="")
+        ttk.Combobox(
+            self.resample_frame,
+            textvariable=self.resample_var,
+            values=["", "1m", "5m", "15m", "1h", "6h", "1d", "1w"],
+            width=4,
+            style=f"{self.style.prefix}.TCombobox",
+        ).grid(row=0, column=1, sticky="w")
+        self.aggregation_var = tk.StringVar(value="mean")
+        ttk.Combobox(
+            self.resample_frame,
+            textvariable=self.aggregation_var,
+            values=["mean", "min", "max", "last", "count", "sum", "mode"],
+            width=6,
+            state="readonly",
+            style=f"{self.style.prefix}.TCombobox",
+        ).grid(row=0, column=2, sticky="w", padx=(4, 0))
+
+        def update_resample_visibility(*args):
+            if self.gui.plot_var.get() == "time series":
+                self.resample_frame.pack(fill="x", pady=2, anchor="w", after=max_frame)
+            else:
+                self.resample_frame.pack_forget()
+
+        self.gui.plot_var.trace_add("write", update_resample_visibility)
+        update_resample_visibility()
+
         # --- FORECASTING Section ---
         self.section_separator("FORECASTING")
         (self.extrapolation_cb, self.extrapolation_var) = self._add_dropdown(
             self.gui.left_frame,
             "extrapolations",
             var_name="extrapolation_var",
-            values=["", "linear", "quadratic"],
+            values=["", "linear", "quadratic", "simple", "holt", "holt-winters"],
             button=""  # small forecast plot button
         )
 
+        # Bootstrap resamples for the prediction band of linear/quadratic trends (0: no band)
+        bands_frame = ttk.Frame(self.gui.left_frame)
+        ttk.Label(
+            bands_frame,
+            text="band resamples:",
+            style=f"{self.style.prefix}.TLabel"
+        ).grid(row=0, column=0, sticky="w", padx=(12, 4))
+        self.bands_var = tk.StringVar(value="0")
+        tk.Entry(
+            bands_frame,
+            textvariable=self.bands_var,
+            width=6,
+            background="#dcdad5",
+        ).grid(row=0, column=1, sticky="w")
+        bands_frame.pack(fill="x", pady=2, anchor="w")
+
         self.section_item_separator(5)
 
     # --- Helper Methods ---
@@ -618,7 +703,8 @@ class GUIRenderer:
         elif var_names:
             self.gui.var_var.set(var_names[0])
 
-    def get_plot_data(self, extrapolation_method = None, x_min = None, x_max = None, resolution = 2) -> Optional[PlotData]:
+    def get_plot_data(self, extrapolation_method = None, x_min = None, x_max = None, resolution = 2, window = None,
+                      resample = None, aggregation = "mean", bins = "fixed", bands = 0) -> Optional[PlotData]:
         """
         Common logic to fetch PlotData, either from actual variable data
         or extrapolation.
@@ -636,11 +722,15 @@ class GUIRenderer:
             variable_data = self.gui.app.get_extrapolation_plot_data(
                 obj_name, var_name,
                 x_min = x_min, x_max= x_max, precision=360, method=extrapolation_method,
+                # One point per horizontal pixel is as much as the plot can show
+                max_points=max(2, self.gui.canvas.get_tk_widget().winfo_width()),
+                bands=bands,
             )
         else:
             variable_data = variable.data
 
-        return self.gui.app.get_plot_data(obj_name, var_name, plot_type, variable_data, resolution)
+        return self.gui.app.get_plot_data(obj_name, var_name, plot_type, variable_data, resolution, window,
+                                          resample or None, aggregation, bins)
 
     def render_plot(self, plot_data: PlotData, x_min=None, x_max=None):
         """Handles the actual matplotlib drawing."""
@@ -649,8 +739,24 @@ class GUIRenderer:
         self.gui.ax.clear()
         self.gui.ax.grid(color=self.style.grid_color, linestyle="--", linewidth=0.5)
 
+        if plot_data.plot_type == "rolling":
+            series = plot_data.series or {}
+            # Min-max envelope, mean ± std band, then the moving mean on top
+            self.gui.ax.fill_between(plot_data.x, series["min"], series["max"],
+                                     color=self.style.primary_fg, alpha=0.12, linewidth=0)
+            lower = [m - s for m, s in zip(plot_data.y, series["std"])]
+            upper = [m + s for m, s in zip(plot_data.y, series["std"])]
+            self.gui.ax.fill_between(plot_data.x, lower, upper,
+                                     color=self.style.primary_fg, alpha=0.25, linewidth=0)
+            self.gui.ax.plot(plot_data.x, plot_data.y, linestyle="-", marker="",
+                             linewidth=1.6, color=self.style.primary_fg)
+
         if plot_data.plot_type == "time series":
             if self.extrapolation_var.get() != "":
+                if plot_data.series and "lower" in plot_data.series:
+                    # Bootstrap prediction band behind the forecast
+                    self.gui.ax.fill_between(plot_data.x, plot_data.series["lower"], plot_data.series["upper"],
+                                             color=self.style.primary_fg, alpha=0.2, linewidth=0)
                 # Smooth line only for extrapolation
                 self.gui.ax.plot(
                     plot_data.x,
@@ -672,6 +778,7 @@ class GUIRenderer:
                     color=self.style.primary_fg
                 )
 
+        if plot_data.plot_type in ("time series", "rolling"):
             # Local timezone-aware formatter
             local_tz = datetime.datetime.now().astimezone().tzinfo
             formatter = mdates.DateFormatter('%m/%d/%Y\n%H:%M', tz=local_tz)
@@ -704,7 +811,11 @@ class GUIRenderer:
                 pass
 
         if plot_data.plot_type == "distribution":
-            self.gui.ax.bar(plot_data.x, plot_data.y, width=0.05)
+            if plot_data.widths:
+                # Histogram bins: x holds left edges, bars span the bin width
+                self.gui.ax.bar(plot_data.x, plot_data.y, width=plot_data.widths, align="edge")
+            else:
+                self.gui.ax.bar([str(v) for v in plot_data.x], plot_data.y)
 
         # Titles and labels
         self.gui.ax.set_title(plot_data.title.upper(), color=self.style.primary_fg)
@@ -727,11 +838,23 @@ class GUIRenderer:
         data = self.get_plot_data(extrapolation_method=self.gui.extrapolation_var.get(),
                                   x_min=self.min_date_entry.get_date(),
                                   x_max=self.max_date_entry.get_date(),
-                                  resolution= self.resolution_var.get())
+                                  resolution= self.resolution_var.get(),
+                                  window=self.window_var.get(),
+                                  resample=self.resample_var.get(),
+                                  aggregation=self.aggregation_var.get(),
+                                  bins=self.bins_var.get(),
+                                  bands=self._band_resamples())
         if data:
             self.render_plot(data, x_min=self.min_date_entry.get_date(), x_max=self.max_date_entry.get_date())
             self.display_stats_table(data.stats)
 
+    def _band_resamples(self) -> int:
+        """The band resample count entered, 0 (no band) when blank or invalid."""
+        try:
+            return max(0, int(self.bands_var.get()))
+        except ValueError:
+            return 0
+
     def display_stats_table(self, stats, fixed_column_width: int | None = None, max_column_width: int = 20, max_value_length: int = 8):
         """
         Display stats in a tabular format in the stats_text widget.
@@ -749,7 +872,10 @@ class GUIRenderer:
         self.gui.stats_text.delete("1.0", tk.END)
 
         # Extract non-None values
-        stats_dict = {k: str(v)[0:max_value_length] for k, v in vars(stats).items() if (v is not None) & (k != "frequencies")}
+        stats_dict = {k: str(v)[0:max_value_length] for k, v in vars(stats).items() if (v is not None) & (k not in ("frequencies", "percentiles", "top_values"))}
+        # One column per percentile (p50, p90, ...)
+        for p, v in (stats.percentiles or {}).items():
+            stats_dict[f"p{p:g}"] = str(v)[0:max_value_length]
 
         if not stats_dict:
             self.gui.stats_text.insert(tk.END, "No statistics available.\n")
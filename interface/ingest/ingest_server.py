@@ -0,0 +1,224 @@
+import datetime
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, List, Optional
+
+from application.app import App
+from application.collector import BatchWriter
+from domain import Event, Record
+from infrastructure.processing.json_codec import JsonCodec
+
+
+class IngestValidationError(ValueError):
+    """Raised when a pushed payload does not have the Event/Record shape."""
+
+
+class IngestServer:
+    """
+    Localhost HTTP endpoint through which producers push events.
+
+    POST /events accepts a JSON object, a JSON array or JSON lines (one item per line). Each item
+    is either an Event ({"timestamp": ..., "records": [...]}; the timestamp defaults to now) or a
+    single Record ({"observable": ..., "state": [{"name": ..., "value": ...}]}) stamped now.
+    A request is validated as a whole and answered 202 once its events are queued.
+
+    A single writer thread drains the queue into the App through a BatchWriter, so the repository
+    sees group commits instead of one write per reading. The queue holds at most `queue_size`
+    events: when producers outpace the writer for longer than `enqueue_timeout` seconds, requests
+    are refused as a whole with 503 and a Retry-After header.
+
+    GET /health reports the queue depth and the accepted/written/rejected counters.
+    """
+
+    def __init__(
+            self,
+            app: App,
+            host: str = "127.0.0.1",
+            port: int = 8765,
+            batch_size: int = 1000,
+            flush_interval: float = 1.0,
+            queue_size: int = 10000,
+            enqueue_timeout: float = 0.5,
+    ):
+        self.app = app
+        self.writer = BatchWriter(app, batch_size, flush_interval)
+        self.queue_size = queue_size  # maximum number of events waiting for the writer
+        self.enqueue_timeout = enqueue_timeout
+        self.accepted = 0
+        self.rejected = 0
+        self._pending: Deque[List[Event]] = deque()
+        self._queued = 0
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._writer_thread = threading.Thread(target=self._write_loop, name="ingest-writer", daemon=True)
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # --- parsing / validation ---
+    @staticmethod
+    def parse_payload(body: bytes, content_type: str = "") -> List[Event]:
+        text = body.decode("utf-8").strip()
+        if not text:
+            return []
+
+        if "ndjson" in content_type or "jsonl" in content_type or "json-lines" in content_type:
+            items = [JsonCodec.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            try:
+                data = JsonCodec.loads(text)
+                items = data if isinstance(data, list) else [data]
+            except ValueError:
+                # Content type missing or generic: fall back to JSON lines
+                items = [JsonCodec.loads(line) for line in text.splitlines() if line.strip()]
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return [IngestServer.parse_item(item, now, index) for index, item in enumerate(items)]
+
+    @staticmethod
+    def parse_item(item, now: datetime.datetime, index: int = 0) -> Event:
+        if not isinstance(item, dict):
+            raise IngestValidationError(f"item {index}: expected an object, got {type(item).__name__}")
+        if "records" not in item and "observable" not in item:
+            raise IngestValidationError(f"item {index}: expected an Event or a Record")
+        try:
+            if "records" in item:
+                event = Event.from_dict({"timestamp": now.isoformat(), **item})
+            else:
+                event = Event([Record.from_dict(item)], now)
+        except (KeyError, TypeError, ValueError) as e:
+            raise IngestValidationError(f"item {index}: malformed ({e!r})") from e
+
+        for record in event.records:
+            if not isinstance(record.observable, str):
+                raise IngestValidationError(f"item {index}: observable must be a string")
+            for prop in record.state:
+                if not isinstance(prop.name, str) or isinstance(prop.value, bool) \
+                        or not isinstance(prop.value, (str, int, float)):
+                    raise IngestValidationError(
+                        f"item {index}: property {prop.name!r} must have a string name and a str/int/float value"
+                    )
+        return event
+
+    # --- queueing ---
+    def submit(self, events: List[Event]) -> bool:
+        """
+        Queue the events of one request for writing, all or nothing.
+        False if the queue stayed too full for them (the caller should retry later).
+        """
+        with self._condition:
+            has_room = self._condition.wait_for(
+                lambda: self._queued + len(events) <= self.queue_size or self._queued == 0,
+                timeout=self.enqueue_timeout,
+            )
+            if not has_room:
+                self.rejected += len(events)
+                return False
+            self._pending.append(events)
+            self._queued += len(events)
+            self.accepted += len(events)
+            self._condition.notify_all()
+        return True
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stop.is_set(), timeout=0.2)
+                batches, self._pending = self._pending, deque()
+                self._queued = 0
+                self._condition.notify_all()
+
+            for events in batches:
+                for event in events:
+                    self.writer.add(event)
+            if self.writer.is_due():
+                self.writer.flush()
+            if self._stop.is_set() and not batches:
+                break
+        self.writer.close()
+
+    # --- lifecycle ---
+    def serve_forever(self) -> None:
+        self._writer_thread.start()
+        print(f"Ingest server listening on {self.address}/events")
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def start(self) -> None:
+        """Serve from a background thread (e.g. for benchmarks)."""
+        self._writer_thread.start()
+        threading.Thread(target=self.httpd.serve_forever, name="ingest-http", daemon=True).start()
+
+    def shutdown(self) -> None:
+        if self._stop.is_set():
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        with self._condition:
+            self._stop.set()
+            self._condition.notify_all()
+        if self._writer_thread.is_alive():
+            self._writer_thread.join()
+        print(f"Ingest server stopped ({self.accepted} accepted, {self.rejected} rejected, "
+              f"{self.writer.written} written).")
+
+    def health(self) -> dict:
+        return {
+            "queued": self._queued,
+            "buffered": len(self.writer),
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "written": self.writer.written,
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class IngestRequestHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+                body = JsonCodec.dumpb(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/health":
+                    self._reply(200, server.health())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                if self.path.rstrip("/") != "/events":
+                    self._reply(404, {"error": "not found"})
+                    return
+                try:
+                    events = server.parse_payload(body, self.headers.get("Content-Type", ""))
+                except (IngestValidationError, ValueError, UnicodeDecodeError) as e:
+                    self._reply(400, {"error": str(e)})
+                    return
+                if server.submit(events):
+                    self._reply(202, {"accepted": len(events)})
+                else:
+                    self._reply(503, {"error": "ingest queue full"}, {"Retry-After": "1"})
+
+            def log_message(self, format, *args):
+                pass
+
+        return IngestRequestHandler
@@ -1,8 +1,7 @@
-from application.app import App
-from infrastructure.persistence.json_repository import JsonRepository
-from interface.CLI.input.cli_controller import CLIController
+import sys
+
 from interface.CLI.input.cli_preprocessor import InputPreProcessor
-from interface.GUI.gui_launcher import GUILauncher
+from interface.CLI.server.cli_client import CLIClient
 
 
 class Router:
@@ -13,9 +12,23 @@ class Router:
         preprocessed_args = [InputPreProcessor.normalize(option) for option in args[1:]]
 
         if preprocessed_args[0] == "gui":
+            # Imported on demand: a forwarded command must not pay for loading the application
+            from application.app import App
+            from infrastructure.persistence.json_repository import JsonRepository
+            from interface.GUI.gui_launcher import GUILauncher
+
             print(f"Routing to GUI.")
             gui = GUILauncher()
             gui.prepare(App(JsonRepository()), preprocessed_args[1:])
             gui.launch()
         else:
-            CLIController.execute(preprocessed_args)
+            # A running `serve` answers from its resident App; otherwise run the command here
+            reply = CLIClient().send(preprocessed_args)
+            if reply is None:
+                from interface.CLI.input.cli_controller import CLIController
+                CLIController.execute(preprocessed_args)
+                return
+            print(reply["output"], end="")
+            if reply["error"]:
+                print(reply["error"], end="", file=sys.stderr)
+                sys.exit(1)